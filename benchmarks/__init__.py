@@ -0,0 +1,8 @@
+"""Headless benchmarks for the dashboard's hot paths
+
+Run with `python -m benchmarks` from the repository root. Workbooks and manual
+corpora are generated at multiples of the farm's current data, and every stage
+reports its wall time and its peak traced memory.
+
+`python -m benchmarks.startup` measures cold-start import time and time to first render.
+"""
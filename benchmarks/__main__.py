@@ -0,0 +1,167 @@
+"""Time the parse, aggregate, index and search paths at several data sizes
+
+    python -m benchmarks                         # 1x, 10x and 100x the current data
+    python -m benchmarks --scales 1 10 --save baseline.json
+    python -m benchmarks --compare baseline.json # exit 1 if a stage regressed
+
+Each stage is timed `--repeat` times (best run is reported) and then run once more
+under tracemalloc for its peak memory, so tracing overhead never skews the timings.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import dense_retrieval
+from benchmarks import datasets
+
+# The sample prompts from the RAG Assistant tab plus a few longer manual-style questions
+QUERIES = (
+    "What are the best pig breeds for commercial farming?",
+    "How to prevent African Swine Fever?",
+    "What are the housing requirements for pregnant sows?",
+    "how much creep feed should weaners get per day",
+    "vaccination and deworming schedule for growers and finishers",
+    "farrowing pen temperature and ventilation for lactating sows",
+)
+FEED_ITEMS = ('Cruches', 'Premix', 'Soya', 'Creep')
+
+def load_dashboard():
+    """Import the dashboard module outside `streamlit run`"""
+    # Streamlit warns about the missing script run context on every call in bare mode
+    logging.disable(logging.WARNING)
+    import pig_farm_dashboard
+    return pig_farm_dashboard
+
+def measure(func, repeat):
+    """(best seconds, peak traced bytes) for calling func()"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak
+
+def run_getters(analyzer):
+    """Every aggregate the dashboard tabs read, computed cold"""
+    analyzer.invalidate_cache()
+    analyzer.get_summary_metrics()
+    analyzer.get_expense_breakdown()
+    analyzer.get_feed_analysis()
+    analyzer.get_feed_efficiency(FEED_ITEMS)
+    analyzer.get_contributors()
+    analyzer.get_individual_contributions()
+    analyzer.get_individual_totals()
+    analyzer.get_individual_monthly_totals()
+
+def run_scale(dashboard, scale, repeat, work_dir):
+    """{stage: (seconds, peak bytes)} for one data scale"""
+    results = {}
+    months, items = datasets.scale_workbook_size(scale)
+    workbook_path = datasets.write_workbook(os.path.join(work_dir, f"farm_{scale}x.xlsx"), months, items)
+
+    analyzer = dashboard.CasaDeFoAnalyzer(data={})
+    results['parse.pandas'] = measure(lambda: analyzer.parse_excel_data(workbook_path, fallback=False, streaming=False), repeat)
+    results['parse.streaming'] = measure(lambda: analyzer.parse_excel_data(workbook_path, fallback=False, streaming=True), repeat)
+    parsed = analyzer.parse_excel_data(workbook_path, fallback=False)
+    if not parsed:
+        raise RuntimeError(f"Generated workbook {workbook_path} did not parse")
+
+    results['facts'] = measure(lambda: analyzer.set_data(parsed), repeat)
+    results['getters'] = measure(lambda: run_getters(analyzer), repeat)
+
+    # An empty data folder keeps real manuals out; the synthetic corpus is indexed directly
+    knowledge_base = dashboard.RAGKnowledgeBase(data_folder=os.path.join(work_dir, f"rag_{scale}x"))
+    knowledge_base.manuals = datasets.manual_corpus(scale)
+    results['index'] = measure(knowledge_base._index_documents, repeat)
+    for ranker in ('keyword', 'bm25'):
+        results[f'search.{ranker}'] = measure(
+            lambda: [knowledge_base.rag_search(query, ranker=ranker) for query in QUERIES], repeat
+        )
+    # Dense retrieval with a random static model: times encoding and search, not ranking quality
+    model_path = datasets.write_static_model(os.path.join(work_dir, "static-model"))
+    encoder = dense_retrieval.load_encoder(model_path)
+    texts = [doc['content'] for doc in knowledge_base.documents]
+    results['index.dense'] = measure(
+        lambda: dense_retrieval.DenseIndex.build(encoder, texts, os.path.join(work_dir, f"dense_{scale}x")), repeat
+    )
+    knowledge_base.dense_model = model_path
+    knowledge_base._build_dense_index()
+    results['search.dense'] = measure(
+        lambda: [knowledge_base.rag_search(query, ranker='dense') for query in QUERIES], repeat
+    )
+    # Repeated questions answered from a warm QueryCache, as the RAG Assistant does
+    query_cache = dashboard.QueryCache()
+    # Fill the cache first so every timed run is all hits, whatever --repeat is
+    for query in QUERIES:
+        query_cache.search(knowledge_base, query)
+    results['search.cached'] = measure(
+        lambda: [query_cache.search(knowledge_base, query) for query in QUERIES], repeat
+    )
+
+    return results
+
+def find_regressions(results, baseline, tolerance, min_seconds=0.005):
+    """Stages slower or hungrier than the baseline by more than `tolerance` times"""
+    regressions = []
+    for key, current in results.items():
+        if key not in baseline:
+            continue
+        seconds, peak = current['seconds'], current['peak_bytes']
+        base_seconds, base_peak = baseline[key]['seconds'], baseline[key]['peak_bytes']
+        # Stages this fast are mostly timer noise
+        if seconds > min_seconds and seconds > base_seconds * tolerance:
+            regressions.append(f"{key}: {base_seconds:.4f}s -> {seconds:.4f}s")
+        if peak > base_peak * tolerance:
+            regressions.append(f"{key}: {base_peak / 2**20:.2f} MB -> {peak / 2**20:.2f} MB peak")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='multiples of the current workbook and manual sizes (default: 1 10 100)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage; the best is reported')
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='JSON from an earlier --save to check against')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='slowdown or memory growth factor counted as a regression (default: 1.5)')
+    args = parser.parse_args(argv)
+
+    dashboard = load_dashboard()
+    results = {}
+    print(f"{'stage':<18}{'scale':>7}{'seconds':>12}{'peak MB':>10}")
+
+    with tempfile.TemporaryDirectory(prefix='casadefo-bench-') as work_dir:
+        for scale in args.scales:
+            for stage, (seconds, peak) in run_scale(dashboard, scale, args.repeat, work_dir).items():
+                results[f"{stage}@{scale}x"] = {'seconds': seconds, 'peak_bytes': peak}
+                print(f"{stage:<18}{f'{scale}x':>7}{seconds:>12.4f}{peak / 2**20:>10.2f}", flush=True)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Synthetic workbooks and manual corpora sized as multiples of the farm's current data
+
+Workbooks follow the month sheet layout parse_workbook expects (feed calculation,
+projected expenses, breakdown of expenses incurred), so they can also be dropped
+into data/excel/ to load-test the dashboard:
+
+    python -m benchmarks.datasets data/excel/synthetic_farm.xlsx --months 120 --items 200
+"""
+import argparse
+import calendar
+import os
+
+import numpy as np
+import openpyxl
+
+# What scale 1 means: the shipped workbook has three month sheets with a handful
+# of rows per section, and the manuals folder holds about 25k words in four PDFs
+BASE_MONTHS = 3
+BASE_ITEMS = 10
+BASE_WORDS = 25000
+BASE_MANUALS = 4
+CONTRIBUTORS = ('Yami', 'Mike', 'Kali')
+
+# Projected expense items the Feed Consumption tab counts as feed
+FEED_SUPPLIES = (('Cruches(20 kg)', 0.74, 3), ('Premix()', 0.03, 42), ('Soya ', 0.33, 36), ('Creep', None, 32))
+OTHER_SUPPLIES = ('Rent', 'Pay', 'Servicing Guilts', 'Iron', 'Ivermectin', 'Limoxin', 'Hay', 'Broom', 'Cement', 'Injections')
+PIG_GROUPS = (('Pregnant', 2.0, 1), ('Dry', 2.0, 1), ('Lactating', 4.5, 1), ('Weaners', 0.5, 20), ('Growers', 1.75, 20))
+
+WORDS_PER_PAGE = 400
+MANUAL_VOCABULARY = (
+    "pig pigs sow sows boar gilt gilts piglet piglets weaner weaners grower finisher "
+    "litter farrowing weaning breeding heat service mating pregnancy lactating "
+    "feed feeding ration protein energy fibre maize soya premix creep crushes water "
+    "housing pen pens floor slatted bedding ventilation temperature shade drainage "
+    "health disease vaccine vaccination biosecurity quarantine fever swine dysentery "
+    "iron injection deworming ivermectin records growth weight market carcass bacon "
+    "daily weekly kg per day should must provide keep clean dry ensure monitor the "
+    "and of to a in for with on at from is are be by this that each every"
+).split()
+
+def scale_workbook_size(scale):
+    """(months, items per section) for a workbook `scale` times the current size"""
+    return BASE_MONTHS * scale, BASE_ITEMS
+
+def contributor_names(contributors):
+    """Contributor names from a list of names or a count, starting with the current partners"""
+    if not isinstance(contributors, int):
+        return list(contributors)
+    return [CONTRIBUTORS[i] if i < len(CONTRIBUTORS) else f"Partner {i + 1}" for i in range(contributors)]
+
+def feed_category_rows(feed_categories, rng):
+    """(notes, category, average kg/day, # of pigs) for each feed calculation row"""
+    rows = []
+    for i in range(feed_categories):
+        notes, daily, pigs = PIG_GROUPS[i % len(PIG_GROUPS)]
+        # Individual sows are A1, A2, ...; the groups are batches of piglets
+        category = f"A{i + 1}" if pigs == 1 else f"Batch {i + 1}"
+        rows.append((notes, category, round(daily * rng.uniform(0.8, 1.2), 2), int(pigs * rng.integers(1, 4)) if pigs > 1 else 1))
+    return rows
+
+def expense_item_names(items):
+    """Projected expense line items, feed supplies first"""
+    names = [name for name, _, _ in FEED_SUPPLIES[:items]]
+    for i in range(len(names), items):
+        other = OTHER_SUPPLIES[(i - len(FEED_SUPPLIES)) % len(OTHER_SUPPLIES)]
+        cycle = (i - len(FEED_SUPPLIES)) // len(OTHER_SUPPLIES)
+        names.append(other if cycle == 0 else f"{other} {cycle + 1}")
+    return names
+
+def write_workbook(path, months=BASE_MONTHS, items=BASE_ITEMS, contributors=CONTRIBUTORS,
+                   feed_categories=None, start_month=9, start_year=2025, seed=0):
+    """Write a workbook with `months` month sheets in the layout parse_workbook expects
+
+    items: projected expense and breakdown rows per month
+    contributors: partner names, or how many partners to generate
+    feed_categories: feed calculation rows per month (defaults to `items`)
+    """
+    rng = np.random.default_rng(seed)
+    names = contributor_names(contributors)
+    feed_rows = feed_category_rows(items if feed_categories is None else feed_categories, rng)
+    item_names = expense_item_names(items)
+    workbook = openpyxl.Workbook(write_only=True)
+
+    for index in range(months):
+        month = (start_month - 1 + index) % 12 + 1
+        year = start_year + (start_month - 1 + index) // 12
+        month_name = calendar.month_name[month]
+        days = calendar.monthrange(year, month)[1]
+        sheet = workbook.create_sheet(f"{month_name} {year} Expenses")
+
+        sheet.append([None, f"{month_name} Feed Calculation", None, None, None, None, None])
+        sheet.append([None, 'Notes', 'Category', 'Average KGs/Day', '# of pigs', '# of days', 'Total (kg)'])
+        feed_total = 0.0
+        for notes, category, daily, pigs in feed_rows:
+            total = round(daily * pigs * days, 2)
+            feed_total += total
+            sheet.append([None, notes, category, daily, pigs, days, total])
+        sheet.append([None, 'Grand Total (kg)', None, None, None, None, round(feed_total, 2)])
+
+        sheet.append([None, 'Projected Expenses', 'Ratio / Tonne', 'KGs Needed', 'Rounded Off /bag', 'Price', 'Total'])
+        costs = []
+        for i, name in enumerate(item_names):
+            if i < len(FEED_SUPPLIES):
+                _, ratio, price = FEED_SUPPLIES[i]
+                kgs = round(feed_total * ratio, 2) if ratio else 50
+                bags = max(1, round(kgs / 20))
+                sheet.append([None, name, ratio, kgs, bags, price, bags * price])
+                costs.append(bags * price)
+            else:
+                cost = int(rng.integers(5, 200))
+                sheet.append([None, name, None, None, None, None, cost])
+                costs.append(cost)
+        sheet.append([None, f"Total Projected {month_name} Expenses", None, None, None, None, sum(costs)])
+
+        sheet.append([None, 'Breakdown of Expenses Incurred', None, None] + names)
+        totals = [0.0] * len(names)
+        for name, cost in zip(item_names, costs):
+            # Most purchases are paid by one partner; about one in five is split
+            amounts = [0.0] * len(names)
+            payer = int(rng.integers(0, len(names)))
+            if len(names) > 1 and rng.random() < 0.2:
+                other = (payer + 1) % len(names)
+                amounts[payer] = amounts[other] = cost / 2
+            else:
+                amounts[payer] = float(cost)
+            totals = [total + amount for total, amount in zip(totals, amounts)]
+            sheet.append([None, name.strip(), None, None] + amounts)
+        sheet.append([None, 'Expense Contribution per Individual', None, None] + totals)
+
+    workbook.save(path)
+    return path
+
+def manual_corpus(scale=1, seed=0):
+    """{manual name: text} with `scale` times the current manual word count
+
+    Pages end in a form feed, matching what load_backend_data builds from PDFs.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(MANUAL_VOCABULARY)
+    manual_count = BASE_MANUALS * scale
+    words_per_manual = BASE_WORDS // BASE_MANUALS
+    manuals = {}
+
+    for index in range(manual_count):
+        words = vocabulary[rng.integers(0, len(vocabulary), words_per_manual)]
+        pages = [" ".join(words[start:start + WORDS_PER_PAGE]) for start in range(0, len(words), WORDS_PER_PAGE)]
+        manuals[f"Synthetic-Manual-{index + 1:03d}.pdf"] = "".join(f"{page}\f" for page in pages)
+
+    return manuals
+
+def write_static_model(path, dim=128, seed=0):
+    """Write a random static word-vector model (vocab.txt + embeddings.npy) over the corpus vocabulary
+
+    Good for timing the dense retriever; its rankings mean nothing.
+    """
+    os.makedirs(path, exist_ok=True)
+    vocabulary = sorted(set(MANUAL_VOCABULARY))
+    with open(os.path.join(path, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocabulary) + "\n")
+    rng = np.random.default_rng(seed)
+    np.save(os.path.join(path, "embeddings.npy"), rng.standard_normal((len(vocabulary), dim)).astype(np.float32))
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.datasets',
+                                     description='Write a synthetic CasaDeFo expense workbook')
+    parser.add_argument('path', help='output .xlsx path, e.g. data/excel/synthetic_farm.xlsx')
+    parser.add_argument('--months', type=int, default=120, help='month sheets to write (default: 120)')
+    parser.add_argument('--items', type=int, default=200, help='expense line items per month (default: 200)')
+    parser.add_argument('--contributors', default='3',
+                        help='number of partners, or comma-separated names (default: 3)')
+    parser.add_argument('--feed-categories', type=int, help='feed calculation rows per month (default: --items)')
+    parser.add_argument('--start', default='2025-09', help='first month as YYYY-MM (default: 2025-09)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for amounts and payers')
+    args = parser.parse_args(argv)
+
+    contributors = int(args.contributors) if args.contributors.isdigit() else [
+        name.strip() for name in args.contributors.split(',') if name.strip()
+    ]
+    start_year, start_month = (int(part) for part in args.start.split('-'))
+    write_workbook(args.path, args.months, args.items, contributors, args.feed_categories,
+                   start_month=start_month, start_year=start_year, seed=args.seed)
+    print(f"Wrote {args.months} months x {args.items} items to {args.path}")
+
+if __name__ == '__main__':
+    main()
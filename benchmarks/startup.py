@@ -0,0 +1,83 @@
+"""Cold-start cost of the dashboard: module imports and time to first render
+
+    python -m benchmarks.startup             # best of 3 fresh processes
+    python -m benchmarks.startup --top 20    # list more of the slowest imports
+
+Every measurement runs in a new interpreter, so nothing is already in
+sys.modules. Import times come from `python -X importtime`; the first render is
+one headless run of the Overview tab through streamlit's AppTest.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(REPO_ROOT, 'pig_farm_dashboard.py')
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$')
+
+FIRST_RENDER_SCRIPT = """
+import logging, time
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({path!r}, default_timeout=600)
+start = time.perf_counter()
+app.run()
+print(time.perf_counter() - start)
+if app.exception:
+    raise SystemExit(app.exception[0].value)
+"""
+
+def import_times():
+    """[(module, cumulative seconds, depth)] for importing the dashboard in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import pig_farm_dashboard'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing the dashboard failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            # importtime indents nested imports by two spaces per level
+            depth = (len(match.group(3)) - 1) // 2
+            modules.append((match.group(4), int(match.group(2)) / 1e6, depth))
+    return modules
+
+def first_render_seconds():
+    """Seconds for the first headless run of the dashboard script in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_RENDER_SCRIPT.format(path=DASHBOARD)],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Rendering the dashboard failed:\n{result.stderr[-2000:]}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup', description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='fresh processes per measurement; the best is reported')
+    parser.add_argument('--top', type=int, default=10, help='slowest top-level imports to list (default: 10)')
+    args = parser.parse_args(argv)
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda modules: modules[-1][1])
+    total = best[-1][1]
+    render = min(first_render_seconds() for _ in range(args.repeat))
+
+    print(f"{'import pig_farm_dashboard':<40}{total:>10.3f}s")
+    print(f"{'first render (Overview)':<40}{render:>10.3f}s")
+    print()
+    print("Slowest imports made by the dashboard:")
+    # Depth 1 modules are the ones the dashboard (and its own modules) pull in directly
+    direct = sorted((entry for entry in best if entry[2] == 1), key=lambda entry: -entry[1])
+    for module, seconds, _ in direct[:args.top]:
+        print(f"  {module:<38}{seconds:>10.3f}s")
+
+if __name__ == '__main__':
+    main()
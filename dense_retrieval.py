@@ -0,0 +1,233 @@
+"""Optional dense-vector retrieval for the RAG knowledge base
+
+Chunks are encoded offline by a small embedding model kept on disk under
+data/models/ (nothing is ever downloaded) and the vectors are stored in a
+memory-mapped .npy file, float32 by default or float16 for half the disk and
+page cache. Queries are answered with batched dot products, or through an
+inverted-file (IVF) index once a full scan would get slow.
+
+Two model layouts are understood:
+- a sentence-transformers model directory, used when that package is installed
+- a static word-vector model: vocab.txt (one token per line) and embeddings.npy
+  with one row per token, which needs nothing beyond NumPy
+
+When neither is present find_model() returns None and the dashboard keeps its
+keyword and BM25 rankers.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import threading
+
+import numpy as np
+
+MODEL_ROOT = os.path.join("data", "models")
+# Below this many vectors a full scan is already fast, so no IVF index is built.
+# float16 rows have to be converted before every scan, which makes them several times slower.
+IVF_MIN_VECTORS = {"float32": 50000, "float16": 10000}
+# Inverted lists probed per query; more lists trade latency for recall
+IVF_NPROBE = 12
+# Rows converted to float32 at a time during a full scan
+SCAN_BATCH_ROWS = 32768
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+def is_static_model(path):
+    return os.path.isfile(os.path.join(path, "vocab.txt")) and os.path.isfile(os.path.join(path, "embeddings.npy"))
+
+def is_sentence_transformer(path):
+    return (
+        os.path.isfile(os.path.join(path, "modules.json"))
+        and importlib.util.find_spec("sentence_transformers") is not None
+    )
+
+def find_model(model_root=MODEL_ROOT):
+    """Path of the first usable embedding model under model_root, or None"""
+    if not os.path.isdir(model_root):
+        return None
+    for name in sorted(os.listdir(model_root)):
+        path = os.path.join(model_root, name)
+        if is_static_model(path) or is_sentence_transformer(path):
+            return path
+    return None
+
+def model_fingerprint(path):
+    """Hash of the model's file names, sizes and mtimes; changes when the model is replaced"""
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            stat = os.stat(file_path)
+            entries.append(f"{os.path.relpath(file_path, path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(sorted(entries)).encode("utf-8")).hexdigest()
+
+def normalize_rows(vectors):
+    """Scale rows to unit length so inner products are cosine similarities; zero rows stay zero"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+class StaticEncoder:
+    """Mean of per-token vectors from a vocab.txt + embeddings.npy model"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "vocab.txt"), encoding="utf-8") as f:
+            self.vocab = {token.strip(): i for i, token in enumerate(f) if token.strip()}
+        self.embeddings = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="r")
+        self.dim = self.embeddings.shape[1]
+        self.name = f"static:{os.path.basename(os.path.normpath(path))}"
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            ids = [self.vocab[token] for token in TOKEN_PATTERN.findall(text.lower()) if token in self.vocab]
+            if ids:
+                vectors[i] = np.asarray(self.embeddings[ids], dtype=np.float32).mean(axis=0)
+        return normalize_rows(vectors)
+
+class SentenceTransformerEncoder:
+    """A sentence-transformers model loaded from a local directory"""
+
+    def __init__(self, path):
+        # A local path never needs the hub; this keeps a missing file from turning into a download
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(path, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers:{os.path.basename(os.path.normpath(path))}"
+
+    def encode(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+def load_encoder(path):
+    """Encoder for the model at path, loaded once per process and model version
+
+    encoder.key identifies the model version, so indexes built by another model are not reused.
+    """
+    fingerprint = model_fingerprint(path)
+    key = (os.path.abspath(path), fingerprint)
+    with _encoders_lock:
+        if key not in _encoders:
+            encoder = StaticEncoder(path) if is_static_model(path) else SentenceTransformerEncoder(path)
+            encoder.key = f"{encoder.name}:{fingerprint}"
+            _encoders[key] = encoder
+        return _encoders[key]
+
+def build_ivf(vectors, nlist, iterations=8, seed=0):
+    """(centroids, order, offsets) of a spherical k-means IVF index over unit vectors
+
+    Documents in list c are order[offsets[c]:offsets[c + 1]].
+    """
+    rng = np.random.default_rng(seed)
+    count = len(vectors)
+    # Centroids are trained on a sample; sorted ids keep reads from the memmap sequential
+    sample_ids = np.sort(rng.choice(count, min(count, nlist * 64), replace=False))
+    sample = np.asarray(vectors[sample_ids], dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        filled = np.bincount(assignments, minlength=nlist) > 0
+        # Empty lists keep their previous centroid
+        centroids[filled] = normalize_rows(sums[filled])
+
+    assignments = np.empty(count, dtype=np.int32)
+    for start in range(0, count, SCAN_BATCH_ROWS):
+        block = np.asarray(vectors[start:start + SCAN_BATCH_ROWS], dtype=np.float32)
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    order = np.argsort(assignments, kind="stable").astype(np.int64)
+    offsets = np.searchsorted(assignments[order], np.arange(nlist + 1))
+    return centroids, order, offsets
+
+def top_ids(scores, ids, top_k):
+    """ids of the top_k scores, best first, ties broken by id like the BM25 ranker"""
+    if len(scores) > top_k:
+        keep = np.argpartition(-scores, top_k - 1)[:top_k]
+        scores, ids = scores[keep], ids[keep]
+    return ids[np.lexsort((ids, -scores))]
+
+class DenseIndex:
+    """Unit-length document vectors in a memory-mapped .npy, searched by inner product
+
+    An index directory holds vectors.npy, ivf.npz for large indexes, and
+    manifest.json, which is written last so a half-built index is never opened.
+    """
+
+    def __init__(self, index_dir):
+        with open(os.path.join(index_dir, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        self.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+        if len(self.vectors) != self.manifest["count"]:
+            raise ValueError(f"{index_dir} holds {len(self.vectors)} vectors, expected {self.manifest['count']}")
+        self.ivf = None
+        if self.manifest.get("nlist"):
+            with np.load(os.path.join(index_dir, "ivf.npz")) as ivf:
+                self.ivf = (ivf["centroids"], ivf["order"], ivf["offsets"])
+
+    @classmethod
+    def build(cls, encoder, texts, index_dir, dtype="float32", batch_size=256):
+        """Encode texts batch by batch straight into a memory-mapped vector file"""
+        os.makedirs(index_dir, exist_ok=True)
+        manifest_path = os.path.join(index_dir, "manifest.json")
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        vectors_path = os.path.join(index_dir, "vectors.npy")
+        vectors = np.lib.format.open_memmap(vectors_path, mode="w+", dtype=dtype, shape=(len(texts), encoder.dim))
+        for start in range(0, len(texts), batch_size):
+            vectors[start:start + batch_size] = encoder.encode(texts[start:start + batch_size])
+        vectors.flush()
+
+        nlist = 0
+        if len(texts) >= IVF_MIN_VECTORS[dtype]:
+            nlist = int(np.sqrt(len(texts)))
+            centroids, order, offsets = build_ivf(vectors, nlist)
+            np.savez(os.path.join(index_dir, "ivf.npz"), centroids=centroids, order=order, offsets=offsets)
+        del vectors
+
+        with open(manifest_path, "w") as f:
+            json.dump({"model": encoder.name, "count": len(texts), "dim": encoder.dim, "dtype": dtype, "nlist": nlist}, f)
+        return cls(index_dir)
+
+    @classmethod
+    def open_or_build(cls, encoder, texts, cache_root, dtype="float32"):
+        """Index for these texts and this model, reusing a previous build when nothing changed"""
+        digest = hashlib.sha256(f"{encoder.key}:{dtype}".encode("utf-8"))
+        for text in texts:
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        index_dir = os.path.join(cache_root, digest.hexdigest()[:32])
+
+        try:
+            index = cls(index_dir)
+        except (OSError, ValueError, KeyError):
+            index = cls.build(encoder, texts, index_dir, dtype=dtype)
+            # Indexes for older manuals or models are never read again
+            for name in os.listdir(cache_root):
+                stale_dir = os.path.join(cache_root, name)
+                if stale_dir != index_dir and os.path.isdir(stale_dir):
+                    shutil.rmtree(stale_dir, ignore_errors=True)
+        return index
+
+    def search(self, query_vector, top_k=5, nprobe=IVF_NPROBE):
+        """Document ids of the top_k vectors by inner product with query_vector, best first"""
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if self.ivf is not None:
+            centroids, order, offsets = self.ivf
+            lists = np.argsort(-(centroids @ query_vector))[:nprobe]
+            ids = np.sort(np.concatenate([order[offsets[c]:offsets[c + 1]] for c in lists]))
+            scores = np.asarray(self.vectors[ids], dtype=np.float32) @ query_vector
+            return top_ids(scores, ids, top_k)
+
+        scores = np.empty(len(self.vectors), dtype=np.float32)
+        for start in range(0, len(self.vectors), SCAN_BATCH_ROWS):
+            block = np.asarray(self.vectors[start:start + SCAN_BATCH_ROWS], dtype=np.float32)
+            scores[start:start + len(block)] = block @ query_vector
+        return top_ids(scores, np.arange(len(scores)), top_k)
@@ -0,0 +1,537 @@
+"""Parsing of CasaDeFo expense workbooks into per-month feed, expense and contribution frames
+
+Nothing here touches Streamlit: parse_workbook() returns the parsed months together
+with a report of what it did, and the dashboard decides how to show it. That keeps
+parsing importable, and measurable, outside a Streamlit run.
+"""
+import calendar
+import contextlib
+import hashlib
+import os
+import posixpath
+import re
+import traceback
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever parse_workbook output changes so existing sidecars are discarded
+PARSER_VERSION = 6
+# Workbooks at least this large are parsed row by row instead of loading whole sheets into pandas
+STREAMING_MIN_BYTES = 5 * 1024 * 1024
+
+MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTH_NUMBERS.update({abbr.lower(): number for number, abbr in enumerate(calendar.month_abbr) if abbr})
+MONTH_NUMBERS['sept'] = 9
+
+# "<Month> [Year] Expenses", e.g. "September Expenses" or "Jan 2026 Expenses"
+MONTH_SHEET_PATTERN = re.compile(r'^\s*([a-z]+\.?(?:\s+\d{4})?)\s+expenses\s*$', re.IGNORECASE)
+
+def parse_month_label(text):
+    """(month number, year or None) for labels like "September" or "Sep 2025", otherwise None"""
+    match = re.match(r'^\s*([a-z]+)\.?(?:\s+(\d{4}))?\s*$', text, re.IGNORECASE)
+    if not match or match.group(1).lower() not in MONTH_NUMBERS:
+        return None
+    year = int(match.group(2)) if match.group(2) else None
+    return MONTH_NUMBERS[match.group(1).lower()], year
+
+def discover_month_sheets(sheet_names):
+    """[(month label, sheet name)] for every month expense sheet, in chronological order"""
+    found = []
+    labels = set()
+    year_offset = 0
+    previous_month = None
+    
+    for sheet_name in sheet_names:
+        match = MONTH_SHEET_PATTERN.match(sheet_name)
+        parsed = parse_month_label(match.group(1)) if match else None
+        if parsed is None:
+            continue
+        month, year = parsed
+        
+        if year is None:
+            # Sheets without a year are taken as consecutive months, so going
+            # backwards in the calendar (e.g. December -> January) starts a new year
+            if previous_month is not None and month < previous_month:
+                year_offset += 1
+            previous_month = month
+            sort_key = (year_offset, month)
+            label = calendar.month_name[month]
+        else:
+            sort_key = (year, month)
+            label = f"{calendar.month_name[month]} {year}"
+        
+        if label in labels:
+            label = sheet_name.strip()
+        labels.add(label)
+        found.append((sort_key, label, sheet_name))
+    
+    found.sort(key=lambda entry: entry[0])
+    return [(label, sheet_name) for _, label, sheet_name in found]
+
+XLSX_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+XLSX_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+def sheet_fingerprints(file_path):
+    """{sheet name: fingerprint} for an .xlsx workbook, read without typing any cells
+
+    A month sheet's fingerprint is the CRC-32 and size of its XML part, a digest of
+    the shared strings its text cells point at and the number formats of the styles
+    it uses, so it changes whenever the sheet's cells, their text or how they are
+    typed change, but not when another sheet adds a string or a style.
+    Other sheets are never parsed, so only their part is fingerprinted.
+    Returns None when the file is not an .xlsx package.
+    """
+    try:
+        return _read_sheet_fingerprints(file_path)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, IndexError):
+        return None
+
+def _read_shared_strings(archive):
+    """Text of every shared string, by index"""
+    try:
+        source = archive.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    text_tag, run_tag = f'{{{XLSX_MAIN_NS}}}t', f'{{{XLSX_MAIN_NS}}}r'
+    strings = []
+    with source:
+        for _, element in ET.iterparse(source):
+            if element.tag == f'{{{XLSX_MAIN_NS}}}si':
+                # Plain text is a <t>, rich text a list of <r><t> runs; phonetic hints are skipped
+                strings.append(''.join(
+                    (child.findtext(text_tag) if child.tag == run_tag else child.text) or ''
+                    for child in element if child.tag in (text_tag, run_tag)
+                ))
+                element.clear()
+    return strings
+
+def _read_cell_formats(archive):
+    """Number format of every cell style, by style index"""
+    try:
+        styles = ET.fromstring(archive.read('xl/styles.xml'))
+    except KeyError:
+        return []
+    codes = {fmt.get('numFmtId'): fmt.get('formatCode') for fmt in styles.iter(f'{{{XLSX_MAIN_NS}}}numFmt')}
+    cell_xfs = styles.find(f'{{{XLSX_MAIN_NS}}}cellXfs')
+    if cell_xfs is None:
+        return []
+    # Built-in formats have an id only; custom ones are identified by their code
+    return [codes.get(xf.get('numFmtId', '0'), xf.get('numFmtId', '0')) for xf in cell_xfs]
+
+# Style indices and the shared-string index of text cells, found in the raw sheet XML.
+# Row styles are picked up too, which only makes a fingerprint slightly stricter.
+STYLE_INDEX_PATTERN = re.compile(rb'\ss=["\'](\d+)')
+SHARED_STRING_INDEX_PATTERN = re.compile(rb'\st=["\']s["\'][^>]*>\s*<(?:\w+:)?v>(\d+)<')
+
+def _sheet_content_digest(archive, path, shared_strings, cell_formats):
+    """Digest of the shared strings and number formats one sheet's cells refer to
+
+    Which cell holds which index is already covered by the CRC of the sheet's part,
+    so the XML is only scanned for the indices, never parsed.
+    """
+    sheet_xml = archive.read(path)
+    digest = hashlib.sha1()
+    for index in SHARED_STRING_INDEX_PATTERN.findall(sheet_xml):
+        digest.update(shared_strings[int(index)].encode('utf-8'))
+        digest.update(b'\0')
+    styles = {0} | {int(index) for index in STYLE_INDEX_PATTERN.findall(sheet_xml)}
+    for style in sorted(styles):
+        digest.update(f"{style}:{cell_formats[style] if style < len(cell_formats) else ''}\0".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def _read_sheet_fingerprints(file_path):
+    with zipfile.ZipFile(file_path) as archive:
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+        
+        def part_id(path):
+            try:
+                info = archive.getinfo(path)
+            except KeyError:
+                return '-'
+            return f"{info.CRC:08x}:{info.file_size}"
+        
+        # String cells only hold an index into sharedStrings.xml and styles an index into
+        # styles.xml; both are shared by every sheet, so each sheet hashes just the entries
+        # it uses. They are read once, and only if the workbook has month sheets.
+        shared_strings = cell_formats = None
+        fingerprints = {}
+        for sheet in workbook.iter(f'{{{XLSX_MAIN_NS}}}sheet'):
+            name = sheet.get('name')
+            target = targets[sheet.get(f'{{{XLSX_REL_NS}}}id')]
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            part = part_id(path)
+            if not MONTH_SHEET_PATTERN.match(name) or part == '-':
+                fingerprints[name] = part
+                continue
+            if shared_strings is None:
+                shared_strings, cell_formats = _read_shared_strings(archive), _read_cell_formats(archive)
+            fingerprints[name] = f"{part}/{_sheet_content_digest(archive, path, shared_strings, cell_formats)}"
+        return fingerprints
+
+def parse_workbook(file_path, reuse=None, streaming=None):
+    """Parse every "<Month> [Year] Expenses" sheet of a workbook
+    
+    Returns (parsed_data, report). parsed_data maps month labels, oldest first, to
+    {'feed', 'expenses', 'individuals'} frames and is empty when no sheet parsed.
+    report holds 'messages' as (level, text) pairs, level being 'info', 'success',
+    'warning', 'error' or 'code', plus 'streaming' and 'reused'.
+    
+    reuse maps sheet names to month data already parsed from an unchanged copy of
+    that sheet; those sheets are not read again. streaming selects parse_month_rows
+    over parse_month_sheet and defaults to workbooks of STREAMING_MIN_BYTES or more.
+    A sheet that fails to parse is reported and skipped; errors opening the workbook raise.
+    Parse time and peak memory at scale are measured by `python -m benchmarks`.
+    """
+    reuse = reuse or {}
+    if streaming is None:
+        streaming = os.path.getsize(file_path) >= STREAMING_MIN_BYTES
+    messages = []
+    report = {'messages': messages, 'streaming': streaming, 'reused': 0}
+    parsed_data = {}
+    
+    with open_month_sheets(file_path, streaming) as (sheet_names, parse_sheet):
+        messages.append(('info', f"📋 Found sheets: {', '.join(sheet_names)}"))
+        
+        month_sheets = discover_month_sheets(sheet_names)
+        if not month_sheets:
+            messages.append(('warning', "⚠️ No '<Month> [Year] Expenses' sheets found"))
+        
+        for month, sheet_name in month_sheets:
+            if sheet_name in reuse:
+                parsed_data[month] = reuse[sheet_name]
+                report['reused'] += 1
+                continue
+            try:
+                feed_df, expense_df, individual_df, row_count = parse_sheet(sheet_name)
+            except Exception as e:
+                messages.append(('error', f"❌ Error parsing {month}: {str(e)}"))
+                messages.append(('code', traceback.format_exc()))
+                continue
+            
+            parsed_data[month] = {'feed': feed_df, 'expenses': expense_df, 'individuals': individual_df}
+            messages.append(('success',
+                f"✅ {month}: {row_count} rows, {len(feed_df)} feed items ({feed_df['Total_kg'].sum():.2f} kg), "
+                f"{len(expense_df)} expenses (${expense_df['Total_Cost'].sum():.2f}), "
+                f"{len(individual_df)} contributions"
+            ))
+    
+    if report['reused']:
+        messages.append(('info', f"♻️ Reused {report['reused']} unchanged month(s), re-parsed {len(parsed_data) - report['reused']}"))
+    return parsed_data, report
+
+@contextlib.contextmanager
+def open_month_sheets(file_path, streaming):
+    """Yield (sheet names, parse_sheet), where parse_sheet(name) returns (feed, expenses, individuals, row count)
+    
+    The streaming reader walks openpyxl read-only rows through parse_month_rows;
+    the default one reads each sheet into a DataFrame for parse_month_sheet.
+    """
+    if streaming:
+        # Only the streaming path needs openpyxl directly; sidecar loads never import it
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield workbook.sheetnames, lambda sheet_name: parse_month_rows(
+                workbook[sheet_name].iter_rows(values_only=True)
+            )
+        finally:
+            workbook.close()
+    else:
+        with pd.ExcelFile(file_path) as workbook:
+            def parse_sheet(sheet_name):
+                # Read without a header row so section titles stay in the data
+                df = workbook.parse(sheet_name, header=None)
+                return (*parse_month_sheet(df), len(df))
+            yield workbook.sheet_names, parse_sheet
+
+def parse_month_sheet(df):
+    """Split one month's sheet into feed, expense and individual frames using whole-frame operations"""
+    df = df.reset_index(drop=True)
+    df.columns = range(df.shape[1])
+    
+    # Lowercased, stripped text of every cell ('' for empty cells) and of every row
+    cells = df.astype(str).where(df.notna(), '')
+    cells = cells.apply(lambda col: col.str.lower().str.strip())
+    row_text = cells[0] if df.shape[1] else pd.Series('', index=df.index)
+    for col in cells.columns[1:]:
+        row_text = row_text + ' ' + cells[col]
+    
+    # === FIND SECTION BOUNDARIES ===
+    is_feed = row_text.str.contains('feed calculation', regex=False)
+    is_expense = ~is_feed & (
+        row_text.str.contains('projected expenses', regex=False)
+        | (row_text.str.contains('ratio', regex=False) & row_text.str.contains('tonne', regex=False))
+    )
+    is_breakdown = ~is_feed & ~is_expense & (
+        row_text.str.contains('breakdown', regex=False) & row_text.str.contains('expenses', regex=False)
+    )
+    feed_row = _mask_position(is_feed, last=True)
+    expense_row = _mask_position(is_expense)
+    breakdown_row = _mask_position(is_breakdown, last=True)
+    
+    # === PARSE FEED DATA ===
+    feed_df = pd.DataFrame(columns=['Category', 'Total_kg'])
+    
+    if feed_row is not None and expense_row is not None:
+        header_row = _section_header_row(cells, feed_row)
+        headers = cells.iloc[header_row]
+        category_col = _mask_position(headers == 'category', last=True)
+        total_kg_col = _mask_position(
+            headers.str.contains('total', regex=False) & headers.str.contains('kg', regex=False), last=True
+        )
+        
+        if category_col is not None and total_kg_col is not None:
+            body = slice(header_row + 1, expense_row)
+            # Stop at the Grand Total row
+            end = _mask_position(row_text.iloc[body].str.contains('grand total', regex=False))
+            section = df.iloc[body].iloc[:end]
+            
+            feed_df = pd.DataFrame({
+                'Category': section[category_col],
+                'Total_kg': pd.to_numeric(section[total_kg_col], errors='coerce').astype(float)
+            }).dropna()
+            feed_df['Category'] = feed_df['Category'].astype(str).str.strip()
+            feed_df = feed_df.reset_index(drop=True)
+    
+    # === PARSE EXPENSES DATA ===
+    expense_df = pd.DataFrame(columns=['Item', 'Total_Cost'])
+    
+    if expense_row is not None and breakdown_row is not None:
+        header_row = _section_header_row(cells, expense_row)
+        # Item names sit under the first labelled header cell
+        item_col = _mask_position(cells.iloc[header_row] != '')
+        body = slice(header_row + 1, breakdown_row)
+        items = cells.iloc[body][item_col]
+        
+        # Stop at the "Total Projected ... Expenses" row
+        end = _mask_position(
+            items.str.contains('total', regex=False)
+            & (items.str.contains('projected', regex=False) | items.str.contains('expenses', regex=False))
+        )
+        section = df.iloc[body].iloc[:end]
+        
+        # Total cost is the last positive number on the row
+        numeric = section.apply(pd.to_numeric, errors='coerce')
+        total_cost = numeric.where(numeric > 0).ffill(axis=1).iloc[:, -1] if len(section.columns) else numeric
+        keep = section[item_col].notna() & total_cost.notna()
+        
+        expense_df = pd.DataFrame({
+            'Item': section.loc[keep, item_col].astype(str).str.strip(),
+            'Total_Cost': total_cost[keep].astype(float)
+        }).reset_index(drop=True)
+    
+    # === PARSE INDIVIDUAL CONTRIBUTIONS ===
+    individual_df = pd.DataFrame(columns=['Category', 'Contributor', 'Amount'])
+    
+    if breakdown_row is not None:
+        header_row = _section_header_row(cells, breakdown_row)
+        headers = cells.iloc[header_row]
+        category_col = _mask_position(headers != '')
+        # Every labelled header cell right of the category column names a contributor
+        contributor_cols = [
+            col for col in headers.index[category_col + 1:]
+            if headers[col] != '' and 'total' not in headers[col]
+        ] if category_col is not None else []
+        
+        if contributor_cols:
+            body = slice(header_row + 1, len(df))
+            categories = cells.iloc[body][category_col]
+            
+            # Stop at the "Expense Contribution per Individual" row
+            end = _mask_position(
+                categories.str.contains('expense contribution', regex=False)
+                | categories.str.contains('per individual', regex=False)
+            )
+            section = df.iloc[body].iloc[:end]
+            section = section[section[category_col].notna()]
+            
+            raw = section[contributor_cols]
+            amounts = raw.apply(pd.to_numeric, errors='coerce')
+            # Rows with a non-numeric amount are skipped, as the row-by-row parser did
+            parseable = ~(raw.notna() & amounts.isna()).any(axis=1)
+            
+            individual_df = long_contributions(
+                section.loc[parseable, category_col].astype(str).str.strip(),
+                df.iloc[header_row][contributor_cols].astype(str).str.strip(),
+                amounts[parseable].fillna(0.0).to_numpy(dtype='float64')
+            )
+    
+    return feed_df, expense_df, individual_df
+
+def parse_month_rows(rows):
+    """Streaming counterpart of parse_month_sheet over an iterable of row value tuples
+    
+    Sections are tracked by a state machine as rows go by, so only the current
+    row and the records parsed so far are held in memory. For sheets with one
+    marker row per section the frames match parse_month_sheet's.
+    Returns (feed_df, expense_df, individual_df, row_count).
+    """
+    feed, expenses, individuals = [], [], []
+    state = None            # section whose rows are being read
+    awaiting_header = None  # section whose header is the next row
+    expense_seen = breakdown_seen = False
+    feed_cols = expense_col = None
+    contributor_cols = contributor_names = None
+    category_col = None
+    row_count = 0
+    
+    for raw in rows:
+        row_count += 1
+        values = [_stream_cell(value) for value in raw]
+        cells = ['' if value is None else str(value).lower().strip() for value in values]
+        row_text = ' '.join(cells)
+        
+        # === SECTION MARKERS ===
+        marker = None
+        if 'feed calculation' in row_text:
+            if not expense_seen:
+                # A later feed title replaces an earlier one
+                marker, feed = 'feed', []
+        elif 'projected expenses' in row_text or ('ratio' in row_text and 'tonne' in row_text):
+            if not expense_seen:
+                marker, expense_seen = 'expenses', True
+        elif 'breakdown' in row_text and 'expenses' in row_text:
+            # A later breakdown title replaces an earlier one
+            marker, breakdown_seen, individuals = 'individuals', True, []
+        
+        if marker is not None:
+            state = None
+            # A title row doubles as the header row when it has other labels
+            if sum(1 for cell in cells if cell) > 1:
+                header_for = marker
+            else:
+                awaiting_header = marker
+                continue
+        elif awaiting_header is not None:
+            header_for, awaiting_header = awaiting_header, None
+        else:
+            header_for = None
+        
+        # === SECTION HEADERS ===
+        if header_for == 'feed':
+            category = [i for i, cell in enumerate(cells) if cell == 'category']
+            total_kg = [i for i, cell in enumerate(cells) if 'total' in cell and 'kg' in cell]
+            feed_cols = (category[-1], total_kg[-1]) if category and total_kg else None
+            state = 'feed' if feed_cols else None
+            continue
+        if header_for == 'expenses':
+            labelled = [i for i, cell in enumerate(cells) if cell]
+            expense_col = labelled[0] if labelled else None
+            state = 'expenses' if expense_col is not None else None
+            continue
+        if header_for == 'individuals':
+            labelled = [i for i, cell in enumerate(cells) if cell]
+            category_col = labelled[0] if labelled else None
+            contributor_cols = [i for i in labelled[1:] if 'total' not in cells[i]]
+            contributor_names = [str(values[i]).strip() for i in contributor_cols]
+            state = 'individuals' if contributor_cols else None
+            continue
+        
+        # === SECTION ROWS ===
+        if state == 'feed':
+            if 'grand total' in row_text:
+                state = None
+                continue
+            category, total_kg = (values[i] if i < len(values) else None for i in feed_cols)
+            total_kg = _stream_number(total_kg)
+            if category is not None and total_kg is not None:
+                feed.append((str(category).strip(), total_kg))
+        
+        elif state == 'expenses':
+            item = values[expense_col] if expense_col < len(values) else None
+            item_text = cells[expense_col] if expense_col < len(cells) else ''
+            if 'total' in item_text and ('projected' in item_text or 'expenses' in item_text):
+                state = None
+                continue
+            # Total cost is the last positive number on the row
+            positive = [number for number in map(_stream_number, values) if number is not None and number > 0]
+            if item is not None and positive:
+                expenses.append((str(item).strip(), positive[-1]))
+        
+        elif state == 'individuals':
+            category = values[category_col] if category_col < len(values) else None
+            category_text = cells[category_col] if category_col < len(cells) else ''
+            if 'expense contribution' in category_text or 'per individual' in category_text:
+                state = None
+                continue
+            if category is None:
+                continue
+            amounts = []
+            for i in contributor_cols:
+                value = values[i] if i < len(values) else None
+                number = _stream_number(value)
+                if value is not None and number is None:
+                    # Rows with a non-numeric amount are skipped, as the row-by-row parser did
+                    break
+                amounts.append(number or 0.0)
+            else:
+                individuals.append((str(category).strip(), amounts))
+    
+    # Feed is bounded by the expense title and expenses by the breakdown title, as in parse_month_sheet
+    feed_df = pd.DataFrame(feed if expense_seen else [], columns=['Category', 'Total_kg'])
+    feed_df['Total_kg'] = feed_df['Total_kg'].astype(float)
+    expense_df = pd.DataFrame(expenses if breakdown_seen else [], columns=['Item', 'Total_Cost'])
+    expense_df['Total_Cost'] = expense_df['Total_Cost'].astype(float)
+    if individuals:
+        individual_df = long_contributions(
+            [category for category, _ in individuals],
+            contributor_names,
+            [amounts for _, amounts in individuals]
+        )
+    else:
+        individual_df = pd.DataFrame(columns=['Category', 'Contributor', 'Amount'])
+    return feed_df, expense_df, individual_df, row_count
+
+# Text pandas.read_excel treats as missing by default, plus Excel error values
+MISSING_CELL_TEXT = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    '#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!'
+])
+
+def _stream_cell(value):
+    """A raw openpyxl value as pd.read_excel would hold it: integral floats as ints, missing text as None"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in MISSING_CELL_TEXT:
+        return None
+    return value
+
+def _stream_number(value):
+    """A cell value as a float the way pd.to_numeric(errors='coerce') reads it, or None"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+def long_contributions(categories, contributors, amounts):
+    """One (Category, Contributor, Amount) row per category and contributor from a categories x contributors grid"""
+    categories = np.asarray(categories, dtype=object)
+    contributors = np.asarray(contributors, dtype=object)
+    return pd.DataFrame({
+        'Category': np.repeat(categories, len(contributors)),
+        'Contributor': np.tile(contributors, len(categories)),
+        'Amount': np.asarray(amounts, dtype='float64').reshape(-1)
+    })
+
+def _mask_position(mask, last=False):
+    """Position of the first (or last) True value in a boolean Series, or None"""
+    positions = np.flatnonzero(mask.to_numpy())
+    if len(positions) == 0:
+        return None
+    return int(positions[-1] if last else positions[0])
+
+def _section_header_row(cells, marker_row):
+    """A section title row doubles as its header row when it has other labels, otherwise headers follow it"""
+    return marker_row if (cells.iloc[marker_row] != '').sum() > 1 else marker_row + 1
@@ -0,0 +1,13 @@
+"""PDF text extraction for the RAG knowledge base.
+
+Lives outside pig_farm_dashboard.py so process pool workers can import it
+without executing the Streamlit script. PyPDF2 is imported on first use, so
+loading the dashboard never pays for it unless a manual actually needs extracting.
+"""
+
+
+def extract_pages(pdf_file):
+    """Extract text from a PDF path or file object, one string per page"""
+    from PyPDF2 import PdfReader
+    pdf_reader = PdfReader(pdf_file)
+    return [page.extract_text() for page in pdf_reader.pages]
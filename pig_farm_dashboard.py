@@ -1,13 +1,28 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 import os
 import time
+import threading
+import json
+import calendar
+import multiprocessing
+import hashlib
 from datetime import datetime
-from PyPDF2 import PdfReader
 import glob
+import re
+import functools
+import itertools
+import shutil
+import traceback
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import manual_ingest
+import excel_parser
+import dense_retrieval
 
 # Set page configuration
 st.set_page_config(
@@ -255,10 +270,24 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 class RAGKnowledgeBase:
-    def __init__(self, data_folder="data"):
+    # Bumped on every re-index and unique across instances, so query caches can key on it
+    _versions = itertools.count(1)
+    
+    def __init__(self, data_folder="data", chunk_size=500, chunk_overlap=0, chunk_boundary="word", chunk_max_words=None, dense_model=None):
         self.data_folder = data_folder
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunk_boundary = chunk_boundary
+        self.chunk_max_words = chunk_max_words
+        self.chunking_stats = {}
+        # Embedding model directory for the "dense" ranker; None picks the first one in data/models
+        self.dense_model = dense_model
+        self.dense_encoder = None
+        self.dense_index = None
+        self.dense_status = ""
         self.manuals = {}
         self.documents = []
+        self.index_version = 0
         self.setup_default_knowledge()
         self.load_backend_data()
     
@@ -308,20 +337,140 @@ class RAGKnowledgeBase:
         os.makedirs(os.path.join(self.data_folder, "manuals"), exist_ok=True)
         os.makedirs(os.path.join(self.data_folder, "excel"), exist_ok=True)
         
+        cache_index = self._load_manual_cache_index()
+        cache_dirty = False
+        
         pdf_files = glob.glob(os.path.join(self.data_folder, "manuals", "*.pdf"))
+        loaded_pages = {}
+        to_extract = {}
+        
         for pdf_file in pdf_files:
             manual_name = os.path.basename(pdf_file)
             if manual_name not in self.manuals:
                 try:
-                    with open(pdf_file, 'rb') as f:
-                        manual_text = self.extract_text_from_pdf(f)
-                        self.manuals[manual_name] = manual_text
-                        st.sidebar.success(f'📚 {manual_name}')
+                    pages, index_entry = self._lookup_manual_cache(pdf_file, cache_index.get(manual_name))
+                    if index_entry != cache_index.get(manual_name):
+                        cache_index[manual_name] = index_entry
+                        cache_dirty = True
+                    if pages is None:
+                        to_extract[manual_name] = (pdf_file, index_entry)
+                    else:
+                        loaded_pages[manual_name] = pages
+                        st.sidebar.success(f'📚 {manual_name} (cached)')
                 except Exception as e:
                     st.sidebar.error(f'❌ {manual_name}: {str(e)}')
         
+        for manual_name, result in self._extract_manuals(to_extract).items():
+            if isinstance(result, Exception):
+                st.sidebar.error(f'❌ {manual_name}: {str(result)}')
+                continue
+            pdf_file, index_entry = to_extract[manual_name]
+            self._store_manual_pages(index_entry['sha256'], manual_name, result)
+            loaded_pages[manual_name] = result
+            st.sidebar.success(f'📚 {manual_name}')
+        
+        # Keep folder order so document ids (and search tie-breaks) stay stable
+        for pdf_file in pdf_files:
+            manual_name = os.path.basename(pdf_file)
+            if manual_name in loaded_pages:
+                # Pages end in a form feed so page-aware chunking can find them again
+                self.manuals[manual_name] = "".join(f"{page_text}\f" for page_text in loaded_pages[manual_name])
+        
+        # Drop index entries for manuals that were removed from the folder
+        present = {os.path.basename(pdf_file) for pdf_file in pdf_files}
+        for manual_name in list(cache_index):
+            if manual_name not in present:
+                del cache_index[manual_name]
+                cache_dirty = True
+        
+        if cache_dirty:
+            self._save_manual_cache_index(cache_index)
+        
         self._index_documents()
     
+    def _manual_cache_dir(self):
+        """Directory holding extracted manual text, one JSON file per PDF content hash"""
+        return os.path.join(self.data_folder, ".cache", "manuals")
+    
+    def _load_manual_cache_index(self):
+        """Load the manual name -> (size, mtime, sha256) index"""
+        index_path = os.path.join(self._manual_cache_dir(), "index.json")
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manual_cache_index(self, cache_index):
+        """Persist the manual cache index atomically"""
+        self._write_json_atomic(os.path.join(self._manual_cache_dir(), "index.json"), cache_index)
+    
+    def _write_json_atomic(self, path, payload):
+        """Write JSON to a temp file and rename it into place"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+    
+    def _file_sha256(self, path):
+        """SHA-256 of a file's contents"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _lookup_manual_cache(self, pdf_file, index_entry):
+        """Return (cached pages or None, refreshed index entry) for a manual"""
+        stat = os.stat(pdf_file)
+        if index_entry and index_entry.get('size') == stat.st_size and index_entry.get('mtime') == stat.st_mtime:
+            sha256 = index_entry['sha256']
+        else:
+            # Size or mtime changed (or first sighting): fall back to the content hash
+            sha256 = self._file_sha256(pdf_file)
+        index_entry = {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': sha256}
+        
+        text_path = os.path.join(self._manual_cache_dir(), f"{sha256}.json")
+        try:
+            with open(text_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['pages'], index_entry
+        except (OSError, ValueError, KeyError):
+            return None, index_entry
+    
+    def _store_manual_pages(self, sha256, manual_name, pages):
+        """Write extracted pages to the content-addressed cache"""
+        text_path = os.path.join(self._manual_cache_dir(), f"{sha256}.json")
+        self._write_json_atomic(text_path, {'source': manual_name, 'pages': pages})
+    
+    def _extract_manuals(self, to_extract):
+        """Extract pages for {manual_name: (pdf_file, ...)}, one process per PDF"""
+        results = {}
+        max_workers = min(len(to_extract), os.cpu_count() or 1)
+        if max_workers <= 1:
+            # Not worth starting a pool for a single manual or a single core
+            for manual_name, (pdf_file, _) in to_extract.items():
+                try:
+                    results[manual_name] = manual_ingest.extract_pages(pdf_file)
+                except Exception as e:
+                    results[manual_name] = e
+            return results
+        
+        # This runs on Streamlit's script or watcher threads, and forking a threaded
+        # process is unsafe; fresh workers only need to import manual_ingest
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)) as pool:
+            futures = {
+                manual_name: pool.submit(manual_ingest.extract_pages, pdf_file)
+                for manual_name, (pdf_file, _) in to_extract.items()
+            }
+            for manual_name, future in futures.items():
+                try:
+                    results[manual_name] = future.result()
+                except Exception as e:
+                    results[manual_name] = e
+        return results
+    
     def _index_documents(self):
         """Index all documents for RAG retrieval"""
         self.documents = []
@@ -335,8 +484,21 @@ class RAGKnowledgeBase:
                     'topic': topic
                 })
         
+        chunk_start = time.perf_counter()
+        total_words = 0
+        total_chunks = 0
+        
         for manual_name, content in self.manuals.items():
-            chunks = self._chunk_text(content, chunk_size=500)
+            chunks, word_count = self._chunk_text(
+                content,
+                chunk_size=self.chunk_size,
+                overlap=self.chunk_overlap,
+                boundary=self.chunk_boundary,
+                max_words=self.chunk_max_words,
+                return_word_count=True
+            )
+            total_words += word_count
+            total_chunks += len(chunks)
             for i, chunk in enumerate(chunks):
                 self.documents.append({
                     'content': chunk,
@@ -344,48 +506,244 @@ class RAGKnowledgeBase:
                     'source': manual_name,
                     'topic': f'Manual Section {i+1}'
                 })
+        
+        chunk_seconds = time.perf_counter() - chunk_start
+        self.chunking_stats = {
+            'words': total_words,
+            'chunks': total_chunks,
+            'seconds': chunk_seconds,
+            'words_per_sec': total_words / chunk_seconds if chunk_seconds > 0 else 0.0
+        }
+        
+        self._build_inverted_index()
+        self._build_bm25_matrix()
+        self._build_dense_index()
+        self.index_version = next(self._versions)
+    
+    def _build_dense_index(self):
+        """Encode every document with the local embedding model, when there is one"""
+        self.dense_encoder, self.dense_index = None, None
+        model_path = self.dense_model or dense_retrieval.find_model(os.path.join(self.data_folder, "models"))
+        if model_path is None:
+            self.dense_status = "off (no embedding model in data/models)"
+            return
+        
+        try:
+            encoder = dense_retrieval.load_encoder(model_path)
+            cache_root = os.path.join(self.data_folder, ".cache", "dense")
+            index = dense_retrieval.DenseIndex.open_or_build(encoder, [doc['content'] for doc in self.documents], cache_root)
+        except Exception as e:
+            # Keyword and BM25 search still work; the dense ranker falls back to BM25
+            self.dense_status = f"off ({e})"
+            return
+        self.dense_encoder, self.dense_index = encoder, index
+        self.dense_status = f"{encoder.name}, {len(self.documents)} vectors"
+    
+    def _build_inverted_index(self):
+        """Build word -> document postings plus a suffix array over the vocabulary"""
+        postings = {}
+        for doc_id, doc in enumerate(self.documents):
+            for word in set(doc['content'].lower().split()):
+                postings.setdefault(word, []).append(doc_id)
+        
+        self._vocabulary = list(postings)
+        self._postings = [postings[word] for word in self._vocabulary]
+        
+        # Every suffix of every vocabulary word, sorted, so a query term's
+        # substring matches are a contiguous prefix range found by bisection
+        suffixes = sorted(
+            (word[start:], word_id)
+            for word_id, word in enumerate(self._vocabulary)
+            for start in range(len(word))
+        )
+        self._suffixes = [suffix for suffix, _ in suffixes]
+        self._suffix_word_ids = [word_id for _, word_id in suffixes]
+    
+    def _tokenize(self, text):
+        """Lowercase alphanumeric tokens used by the BM25 ranker"""
+        return re.findall(r"[a-z0-9]+", text.lower())
+    
+    def _build_bm25_matrix(self, k1=1.5, b=0.75):
+        """Precompute BM25 weights as a sparse document-term matrix (CSC layout)"""
+        term_ids = {}
+        coo_docs = []
+        coo_terms = []
+        coo_tfs = []
+        doc_lengths = np.zeros(len(self.documents), dtype=np.float64)
+        
+        for doc_id, doc in enumerate(self.documents):
+            tokens = self._tokenize(doc['content'])
+            doc_lengths[doc_id] = len(tokens)
+            for token, tf in Counter(tokens).items():
+                coo_docs.append(doc_id)
+                coo_terms.append(term_ids.setdefault(token, len(term_ids)))
+                coo_tfs.append(tf)
+        
+        coo_docs = np.asarray(coo_docs, dtype=np.int64)
+        coo_terms = np.asarray(coo_terms, dtype=np.int64)
+        tf = np.asarray(coo_tfs, dtype=np.float64)
+        
+        n_docs = len(self.documents)
+        avg_length = doc_lengths.mean() if n_docs else 0.0
+        doc_freq = np.bincount(coo_terms, minlength=len(term_ids))
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        
+        length_norm = k1 * (1 - b + b * doc_lengths[coo_docs] / avg_length) if avg_length else k1
+        weights = idf[coo_terms] * tf * (k1 + 1) / (tf + length_norm)
+        
+        # Column-major so a query only reads the columns of its own terms
+        order = np.argsort(coo_terms, kind='stable')
+        self._bm25_term_ids = term_ids
+        self._bm25_indptr = np.concatenate(([0], np.cumsum(doc_freq)))
+        self._bm25_doc_ids = coo_docs[order]
+        self._bm25_weights = weights[order]
+    
+    def _bm25_scores(self, query):
+        """Score every document for a query with one sparse matrix-vector product"""
+        query_counts = Counter(token for token in self._tokenize(query) if token in self._bm25_term_ids)
+        if not query_counts:
+            return np.zeros(len(self.documents))
+        
+        # Gather the nonzeros of the query's columns, scaled by the query term counts
+        columns = [self._bm25_term_ids[token] for token in query_counts]
+        offsets = np.concatenate([
+            np.arange(self._bm25_indptr[col], self._bm25_indptr[col + 1]) for col in columns
+        ])
+        query_weights = np.repeat(
+            np.asarray(list(query_counts.values()), dtype=np.float64),
+            np.diff(self._bm25_indptr)[columns]
+        )
+        return np.bincount(
+            self._bm25_doc_ids[offsets],
+            weights=self._bm25_weights[offsets] * query_weights,
+            minlength=len(self.documents)
+        )
     
-    def _chunk_text(self, text, chunk_size=500):
-        """Split text into chunks for RAG"""
-        words = text.split()
+    def _matching_documents(self, term):
+        """Ids of documents containing a word that has term as a substring"""
+        word_ids = set()
+        pos = bisect_left(self._suffixes, term)
+        while pos < len(self._suffixes) and self._suffixes[pos].startswith(term):
+            word_ids.add(self._suffix_word_ids[pos])
+            pos += 1
+        
+        doc_ids = set()
+        for word_id in word_ids:
+            doc_ids.update(self._postings[word_id])
+        return doc_ids
+    
+    def _chunk_text(self, text, chunk_size=500, overlap=0, boundary="word", max_words=None, return_word_count=False):
+        """Split text into chunks for RAG
+        
+        chunk_size: target characters per chunk; a chunk closes once it exceeds this
+        overlap: number of trailing words repeated at the start of the next chunk,
+            carrying at most half of chunk_size characters so every chunk adds new words
+        boundary: "word", or "sentence"/"page" to close chunks at those boundaries when possible
+        max_words: optional token budget, closing a chunk once it holds this many words
+        """
+        if overlap < 0 or (max_words is not None and overlap >= max_words):
+            raise ValueError("overlap must be non-negative and smaller than max_words")
+        # Even one-letter words need two characters each, so this many can never fit in half a chunk
+        if 2 * overlap - 1 > chunk_size // 2:
+            raise ValueError("overlap must leave room for new words in each chunk_size")
+        
+        if boundary == "word":
+            units = [text.split()]
+        elif boundary == "sentence":
+            units = [sentence.split() for sentence in re.split(r'(?<=[.!?])\s+', text)]
+        elif boundary == "page":
+            units = [page.split() for page in text.split('\f')]
+        else:
+            raise ValueError(f"Unknown chunk boundary: {boundary}")
+        
         chunks = []
         current_chunk = []
+        # Length of ' '.join(current_chunk), maintained incrementally
+        current_length = 0
+        new_words = 0
+        word_count = 0
         
-        for word in words:
-            current_chunk.append(word)
-            if len(' '.join(current_chunk)) > chunk_size:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = []
-        
-        if current_chunk:
+        def close_chunk():
+            nonlocal current_chunk, current_length, new_words
+            chunks.append(' '.join(current_chunk))
+            current_chunk = current_chunk[-overlap:] if overlap else []
+            current_length = sum(len(word) for word in current_chunk) + max(len(current_chunk) - 1, 0)
+            # Long words can make the overlap fill the next chunk on its own; keep it to half
+            while current_length > chunk_size // 2:
+                current_length -= len(current_chunk.pop(0)) + (1 if current_chunk else 0)
+            new_words = 0
+        
+        for unit in units:
+            if not unit:
+                continue
+            word_count += len(unit)
+            
+            if boundary != "word" and new_words:
+                unit_length = sum(len(word) for word in unit) + len(unit) - 1
+                if current_length + 1 + unit_length > chunk_size:
+                    close_chunk()
+            
+            for word in unit:
+                current_length += len(word) + (1 if current_chunk else 0)
+                current_chunk.append(word)
+                new_words += 1
+                if current_length > chunk_size or (max_words is not None and len(current_chunk) >= max_words):
+                    close_chunk()
+        
+        if new_words:
             chunks.append(' '.join(current_chunk))
         
+        if return_word_count:
+            return chunks, word_count
         return chunks
     
+    def extract_pages_from_pdf(self, pdf_file):
+        """Extract text from PDF file, one string per page"""
+        return manual_ingest.extract_pages(pdf_file)
+    
     def extract_text_from_pdf(self, pdf_file):
         """Extract text from PDF file"""
         try:
-            pdf_reader = PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return "".join(f"{page_text}\n" for page_text in self.extract_pages_from_pdf(pdf_file))
         except Exception as e:
             return f"Error reading PDF: {str(e)}"
     
-    def rag_search(self, query, top_k=5):
-        """RAG-based semantic search across all documents"""
+    def rag_search(self, query, top_k=5, ranker="keyword"):
+        """RAG-based semantic search across all documents
+        
+        ranker: "keyword" for the original term hit counter, "bm25" for BM25 ranking,
+        "dense" for embedding similarity (BM25 when no embedding model is loaded)
+        """
+        if ranker == "dense":
+            query_vector = self.dense_encoder.encode([query])[0] if self.dense_index is not None else None
+            # Without a model, or for a query the model has no tokens for, rank by BM25 instead
+            if query_vector is None or not query_vector.any():
+                return self.rag_search(query, top_k=top_k, ranker="bm25")
+            return [self.documents[doc_id] for doc_id in self.dense_index.search(query_vector, top_k)]
+        if ranker == "bm25":
+            scores = self._bm25_scores(query)
+            matches = np.flatnonzero(scores)
+            ranked = matches[np.lexsort((matches, -scores[matches]))]
+            return [self.documents[doc_id] for doc_id in ranked[:top_k]]
+        elif ranker != "keyword":
+            raise ValueError(f"Unknown ranker: {ranker}")
+        
         query = query.lower()
-        scored_documents = []
+        scores = {}
+        term_matches = {}
         
-        for doc in self.documents:
-            score = self._calculate_relevance_score(doc['content'].lower(), query)
-            if score > 0:
-                scored_documents.append((score, doc))
+        # Same scoring as _calculate_relevance_score, but only documents found
+        # through the inverted index are touched
+        for term in query.split():
+            if len(term) > 3:
+                if term not in term_matches:
+                    term_matches[term] = self._matching_documents(term)
+                for doc_id in term_matches[term]:
+                    scores[doc_id] = scores.get(doc_id, 0) + 1.5
         
-        scored_documents.sort(key=lambda x: x[0], reverse=True)
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
         
-        return [doc for score, doc in scored_documents[:top_k]]
+        return [self.documents[doc_id] for doc_id, score in ranked[:top_k]]
     
     def _calculate_relevance_score(self, content, query):
         """Calculate relevance score between content and query"""
@@ -401,584 +759,339 @@ class RAGKnowledgeBase:
         
         return score
 
+def future_month_labels(last_label, count):
+    """Labels for the count months following last_label, keeping its year style"""
+    parsed = excel_parser.parse_month_label(last_label)
+    if parsed is None:
+        return [f"Month +{i}" for i in range(1, count + 1)]
+    
+    month, year = parsed
+    labels = []
+    for _ in range(count):
+        month += 1
+        if month > 12:
+            month = 1
+            year = year + 1 if year is not None else None
+        labels.append(calendar.month_name[month] + (f" {year}" if year is not None else ""))
+    return labels
+
+def memoized_aggregate(method):
+    """Cache an analyzer getter per data version and arguments; results are shared, so treat them as read-only"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = (self.data_version, method.__name__, tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args))
+        with self._memo_lock:
+            if key in self._memo:
+                self.cache_stats['hits'] += 1
+                return self._memo[key]
+        
+        result = method(self, *args)
+        with self._memo_lock:
+            self.cache_stats['misses'] += 1
+            self._memo[key] = result
+        return result
+    return wrapper
+
 class CasaDeFoAnalyzer:
-    def __init__(self):
-        self.data = self.load_data()
+    SECTIONS = ('feed', 'expenses', 'individuals')
+    # Label and value columns kept in each section's fact table
+    FACT_COLUMNS = {
+        'feed': (['Category'], ['Total_kg']),
+        'expenses': (['Item'], ['Total_Cost']),
+        'individuals': (['Category', 'Contributor'], ['Amount'])
+    }
+    # Sidecars written by another parser version are discarded
+    PARSER_VERSION = excel_parser.PARSER_VERSION
+    # Versions are unique across analyzers, so caches keyed on them survive a reload swapping analyzers
+    _versions = itertools.count(1)
+    
+    def __init__(self, data=None, workbook_loader=None):
+        self.data_source = None
+        # Called as workbook_loader(file_path) -> month data or None; lets callers add caching
+        self.workbook_loader = workbook_loader or self.load_workbook
+        self.data_version = 0
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+        self.set_data(self.load_data() if data is None else data)
+    
+    def set_data(self, data):
+        """Install a new dataset, rebuilding the fact tables and dropping memoized aggregates"""
+        with self._memo_lock:
+            self.data = data
+            self.facts = self._build_fact_tables()
+            self.data_version = next(self._versions)
+            self._memo.clear()
+    
+    def reload(self):
+        """Re-read the workbooks and invalidate every cached aggregate"""
+        self.set_data(self.load_data())
+    
+    def invalidate_cache(self):
+        """Drop memoized aggregates without reloading data"""
+        with self._memo_lock:
+            self.data_version = next(self._versions)
+            self._memo.clear()
+        
+    def _build_fact_tables(self):
+        """Consolidate the per-month frames into one typed long table per section"""
+        months = list(self.data.keys())
+        facts = {}
+        
+        for section, (label_cols, value_cols) in self.FACT_COLUMNS.items():
+            frames = [month_data[section].assign(Month=month) for month, month_data in self.data.items()]
+            table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Month'])
+            
+            extra_cols = [col for col in ('Site', 'Source') if col in table.columns]
+            for col in label_cols + value_cols:
+                if col not in table.columns:
+                    table[col] = pd.Series(dtype='float64' if col in value_cols else 'object')
+            table = table[['Month'] + label_cols + value_cols + extra_cols].copy()
+            
+            table['Month'] = pd.Categorical(table['Month'], categories=months, ordered=True)
+            for col in label_cols + extra_cols:
+                labels = table[col].astype(str)
+                table[col] = pd.Categorical(labels, categories=pd.unique(labels))
+            for col in value_cols:
+                table[col] = pd.to_numeric(table[col], errors='coerce').fillna(0.0).astype('float64')
+            
+            facts[section] = table
         
+        return facts
+    
     def load_data(self):
-        """Load data from backend Excel files"""
-        excel_files = glob.glob("data/excel/*.xlsx")
+        """Load and merge every backend Excel workbook"""
+        excel_files = sorted(glob.glob("data/excel/*.xlsx"))
         if excel_files:
-            try:
-                return self.parse_excel_data(excel_files[0])
-            except Exception as e:
-                st.sidebar.error(f"Error reading Excel file: {e}")
-                return self.load_default_data()
-        else:
-            return self.load_default_data()
+            workbooks = self.load_workbooks(excel_files)
+            if workbooks:
+                self.data_source = "excel"
+                return self.merge_workbooks(workbooks)
+            st.sidebar.error("❌ No valid workbook data - using fallback")
+        return self.load_default_data()
+    
+    def load_workbooks(self, excel_files):
+        """Load workbooks concurrently, returning {file_path: month data} for those that parsed"""
+        script_ctx = get_script_run_ctx()
+        
+        def load(file_path):
+            # Let sidebar messages from worker threads reach this session
+            if script_ctx is not None:
+                add_script_run_ctx(threading.current_thread(), script_ctx)
+            return self.workbook_loader(file_path)
+        
+        with ThreadPoolExecutor(max_workers=min(len(excel_files), 8)) as pool:
+            results = list(pool.map(load, excel_files))
+        
+        return {
+            file_path: workbook_data
+            for file_path, workbook_data in zip(excel_files, results)
+            if workbook_data is not None
+        }
     
-    def parse_excel_data(self, file_path):
-        """Parse Excel data from standardized sheet structure"""
+    def load_workbook(self, file_path):
+        """Month data for one workbook from its sidecar or Excel, or None if it could not be parsed
+        
+        When the workbook changed since its sidecar was written, only the month
+        sheets whose fingerprint changed are re-parsed.
+        """
+        sidecar_data = self.load_sidecar(file_path)
+        if sidecar_data is not None:
+            return sidecar_data
         try:
-            # Read all sheets from Excel file
-            excel_data = pd.read_excel(file_path, sheet_name=None)
-            
-            st.sidebar.info(f"📋 Found sheets: {', '.join(excel_data.keys())}")
-            
-            parsed_data = {}
-            
-            # Map of expected sheet names
-            sheet_mapping = {
-                'September': 'September Expenses',
-                'October': 'October Expenses',
-                'November': 'November Expenses'
-            }
-            
-            for month, sheet_name in sheet_mapping.items():
-                try:
-                    if sheet_name in excel_data:
-                        df = excel_data[sheet_name]
-                        st.sidebar.info(f"🔍 Processing {month}: {df.shape[0]} rows x {df.shape[1]} columns")
-                        
-                        # === FIND SECTION BOUNDARIES ===
-                        feed_header_row = None
-                        expense_header_row = None
-                        individual_header_row = None
-                        
-                        for idx in range(len(df)):
-                            row_str = ' '.join([str(val).lower().strip() for val in df.iloc[idx].values if pd.notna(val)])
-                            
-                            # Find feed calculation header
-                            if 'feed calculation' in row_str:
-                                feed_header_row = idx + 1  # Next row has column headers
-                            
-                            # Find projected expenses header
-                            elif 'projected expenses' in row_str or ('ratio' in row_str and 'tonne' in row_str):
-                                if expense_header_row is None:
-                                    expense_header_row = idx + 1 if 'projected' in row_str else idx
-                            
-                            # Find breakdown of expenses header
-                            elif 'breakdown' in row_str and 'expenses' in row_str:
-                                individual_header_row = idx + 1  # Next row has column headers
-                        
-                        st.sidebar.success(f"✓ Found sections - Feed: row {feed_header_row}, Expenses: row {expense_header_row}, Individuals: row {individual_header_row}")
-                        
-                        # === PARSE FEED DATA ===
-                        feed_df = pd.DataFrame(columns=['Category', 'Total_kg'])
-                        
-                        if feed_header_row is not None and expense_header_row is not None:
-                            # Extract feed section
-                            feed_section = df.iloc[feed_header_row:expense_header_row-1].copy()
-                            
-                            # First row is headers
-                            headers = [str(col).strip() for col in feed_section.iloc[0].values]
-                            
-                            # Find Category and Total (kg) columns
-                            category_col = None
-                            total_kg_col = None
-                            
-                            for idx, header in enumerate(headers):
-                                h_lower = header.lower()
-                                if h_lower == 'category':
-                                    category_col = idx
-                                elif 'total' in h_lower and 'kg' in h_lower:
-                                    total_kg_col = idx
-                            
-                            if category_col is not None and total_kg_col is not None:
-                                st.sidebar.info(f"📍 Feed - Category: col {category_col}, Total kg: col {total_kg_col}")
-                                
-                                # Parse data rows
-                                feed_records = []
-                                for idx in range(1, len(feed_section)):
-                                    row = feed_section.iloc[idx]
-                                    
-                                    # Skip Grand Total row
-                                    if pd.notna(row.iloc[0]) and 'grand total' in str(row.iloc[0]).lower():
-                                        break
-                                    
-                                    category = row.iloc[category_col]
-                                    total_kg = row.iloc[total_kg_col]
-                                    
-                                    if pd.notna(category) and pd.notna(total_kg):
-                                        try:
-                                            feed_records.append({
-                                                'Category': str(category).strip(),
-                                                'Total_kg': float(total_kg)
-                                            })
-                                        except (ValueError, TypeError):
-                                            continue
-                                
-                                feed_df = pd.DataFrame(feed_records)
-                                st.sidebar.success(f"✅ Parsed {len(feed_df)} feed items: {feed_df['Total_kg'].sum():.2f} kg total")
-                        
-                        # === PARSE EXPENSES DATA ===
-                        expense_df = pd.DataFrame(columns=['Item', 'Total_Cost'])
-                        
-                        if expense_header_row is not None and individual_header_row is not None:
-                            # Extract expense section
-                            expense_section = df.iloc[expense_header_row:individual_header_row-1].copy()
-                            
-                            # First row is headers
-                            headers = [str(col).strip() for col in expense_section.iloc[0].values]
-                            
-                            # First column is always item name, last column is Total
-                            item_col = 0
-                            total_col = len(headers) - 1
-                            
-                            st.sidebar.info(f"📍 Expenses - Item: col {item_col}, Total: col {total_col}")
-                            
-                            # Parse data rows
-                            expense_records = []
-                            for idx in range(1, len(expense_section)):
-                                row = expense_section.iloc[idx]
-                                
-                                item = row.iloc[item_col]
-                                
-                                # Skip total row
-                                if pd.notna(item):
-                                    item_str = str(item).lower()
-                                    if 'total' in item_str and ('projected' in item_str or 'expenses' in item_str):
-                                        break
-                                
-                                if pd.notna(item):
-                                    # Get last numeric column value
-                                    total_cost = None
-                                    for col_idx in range(len(row)-1, -1, -1):
-                                        try:
-                                            val = float(row.iloc[col_idx])
-                                            if pd.notna(val) and val > 0:
-                                                total_cost = val
-                                                break
-                                        except (ValueError, TypeError):
-                                            continue
-                                    
-                                    if total_cost is not None:
-                                        expense_records.append({
-                                            'Item': str(item).strip(),
-                                            'Total_Cost': total_cost
-                                        })
-                            
-                            expense_df = pd.DataFrame(expense_records)
-                            total_exp = expense_df['Total_Cost'].sum() if not expense_df.empty else 0
-                            st.sidebar.success(f"✅ Parsed {len(expense_df)} expenses: ${total_exp:.2f} total")
-                        
-                        # === PARSE INDIVIDUAL CONTRIBUTIONS ===
-                        individual_df = pd.DataFrame(columns=['Category', 'Yami', 'Mike', 'Kali'])
-                        
-                        if individual_header_row is not None:
-                            # Extract individual section
-                            individual_section = df.iloc[individual_header_row:].copy()
-                            
-                            # First row is headers
-                            headers = [str(col).strip() for col in individual_section.iloc[0].values]
-                            
-                            # Find Yami, Mike, Kali columns
-                            yami_col = None
-                            mike_col = None
-                            kali_col = None
-                            
-                            for idx, header in enumerate(headers):
-                                h_lower = header.lower()
-                                if h_lower == 'yami':
-                                    yami_col = idx
-                                elif h_lower == 'mike':
-                                    mike_col = idx
-                                elif h_lower == 'kali':
-                                    kali_col = idx
-                            
-                            if yami_col is not None and mike_col is not None:
-                                st.sidebar.info(f"📍 Individuals - Yami: col {yami_col}, Mike: col {mike_col}, Kali: col {kali_col}")
-                                
-                                # Parse data rows
-                                individual_records = []
-                                for idx in range(1, len(individual_section)):
-                                    row = individual_section.iloc[idx]
-                                    
-                                    category = row.iloc[0]
-                                    
-                                    # Skip expense contribution per individual row
-                                    if pd.notna(category):
-                                        cat_str = str(category).lower()
-                                        if 'expense contribution' in cat_str or 'per individual' in cat_str:
-                                            break
-                                    
-                                    if pd.notna(category):
-                                        try:
-                                            yami_val = float(row.iloc[yami_col]) if pd.notna(row.iloc[yami_col]) else 0
-                                            mike_val = float(row.iloc[mike_col]) if pd.notna(row.iloc[mike_col]) else 0
-                                            kali_val = float(row.iloc[kali_col]) if kali_col and pd.notna(row.iloc[kali_col]) else 0
-                                            
-                                            individual_records.append({
-                                                'Category': str(category).strip(),
-                                                'Yami': yami_val,
-                                                'Mike': mike_val,
-                                                'Kali': kali_val
-                                            })
-                                        except (ValueError, TypeError, IndexError):
-                                            continue
-                                
-                                individual_df = pd.DataFrame(individual_records)
-                                y_total = individual_df['Yami'].sum()
-                                m_total = individual_df['Mike'].sum()
-                                k_total = individual_df['Kali'].sum()
-                                st.sidebar.success(f"✅ Parsed {len(individual_df)} contributions - Yami: ${y_total:.2f}, Mike: ${m_total:.2f}, Kali: ${k_total:.2f}")
-                        
-                        # Store parsed data
-                        parsed_data[month] = {
-                            'feed': feed_df,
-                            'expenses': expense_df,
-                            'individuals': individual_df
-                        }
-                        
-                        st.sidebar.success(f"✅✅✅ Successfully loaded {month}!")
-                    else:
-                        st.sidebar.warning(f"⚠️ Sheet '{sheet_name}' not found")
-                        
-                except Exception as month_error:
-                    st.sidebar.error(f"❌ Error parsing {month}: {str(month_error)}")
-                    import traceback
-                    st.sidebar.code(traceback.format_exc(), language='python')
-                    continue
-            
-            # Return parsed data or fallback
-            if parsed_data:
-                st.sidebar.success(f"🎉 Successfully loaded {len(parsed_data)} month(s)!")
-                
-                # Fill missing months
-                for month in ['September', 'October', 'November']:
-                    if month not in parsed_data:
-                        parsed_data[month] = {
-                            'feed': pd.DataFrame(columns=['Category', 'Total_kg']),
-                            'expenses': pd.DataFrame(columns=['Item', 'Total_Cost']),
-                            'individuals': pd.DataFrame(columns=['Category', 'Yami', 'Mike', 'Kali'])
-                        }
-                        st.sidebar.info(f"ℹ️ No data for {month}")
-                
-                return parsed_data
-            else:
-                st.sidebar.error("❌ No valid data - using fallback")
-                return self.load_default_data()
-                
+            # Snapshot the workbook before reading it so a save mid-parse is caught next time
+            workbook_state = self.workbook_state(file_path)
+            reuse = self.load_sidecar_sheets(file_path, workbook_state['fingerprints'])
+            parsed_data = self.parse_excel_data(file_path, fallback=False, reuse=reuse)
         except Exception as e:
-            st.sidebar.error(f"❌ Critical error: {str(e)}")
-            import traceback
-            st.sidebar.code(traceback.format_exc(), language='python')
-            return self.load_default_data()
-        """Parse Excel data from backend file with your exact sheet structure"""
+            st.sidebar.error(f"Error reading Excel file {os.path.basename(file_path)}: {e}")
+            return None
+        if parsed_data is not None:
+            self.write_sidecar(file_path, parsed_data, workbook_state)
+        return parsed_data
+    
+    def workbook_state(self, file_path):
+        """Size, mtime and per-sheet fingerprints of a workbook; fingerprints are None for non-.xlsx files"""
+        return {
+            'size': os.path.getsize(file_path),
+            'mtime': os.path.getmtime(file_path),
+            'fingerprints': excel_parser.sheet_fingerprints(file_path)
+        }
+    
+    def merge_workbooks(self, workbooks):
+        """Merge {file_path: month data} into one month-keyed dataset with Site and Source columns"""
+        first_seen = []
+        for workbook_data in workbooks.values():
+            for month in workbook_data:
+                if month not in first_seen:
+                    first_seen.append(month)
+        
+        def month_order(month):
+            # Dated months sort by date; year-less ones keep the order the workbooks list them in
+            parsed = excel_parser.parse_month_label(month)
+            if parsed is not None and parsed[1] is not None:
+                return (parsed[1], parsed[0])
+            return (0, first_seen.index(month))
+        
+        merged = {}
+        for month in sorted(first_seen, key=month_order):
+            merged[month] = {}
+            for section in self.SECTIONS:
+                frames = [
+                    workbook_data[month][section].assign(
+                        Site=os.path.splitext(os.path.basename(file_path))[0],
+                        Source=os.path.basename(file_path)
+                    )
+                    for file_path, workbook_data in workbooks.items()
+                    if month in workbook_data
+                ]
+                merged[month][section] = pd.concat(frames, ignore_index=True)
+        return merged
+    
+    def _sidecar_dir(self, file_path):
+        """Feather sidecar directory stored next to a workbook"""
+        return f"{os.path.splitext(file_path)[0]}.sidecar"
+    
+    def _read_sidecar_manifest(self, sidecar_dir):
+        """The sidecar manifest, or None if it is missing or was written by another parser version"""
+        with open(os.path.join(sidecar_dir, "manifest.json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if manifest['parser_version'] == self.PARSER_VERSION else None
+    
+    def _read_sidecar_month(self, sidecar_dir, i):
+        return {
+            section: pd.read_feather(os.path.join(sidecar_dir, f"{i}_{section}.feather"))
+            for section in self.SECTIONS
+        }
+    
+    def load_sidecar(self, file_path):
+        """Load parsed data from the workbook's Feather sidecar, or None if it is missing or stale"""
+        sidecar_dir = self._sidecar_dir(file_path)
         try:
-            # Read all sheets from Excel file
-            excel_data = pd.read_excel(file_path, sheet_name=None)
-            
-            st.sidebar.info(f"📋 Found sheets: {', '.join(excel_data.keys())}")
-            
-            parsed_data = {}
+            manifest = self._read_sidecar_manifest(sidecar_dir)
+            # The workbook stays the source of truth: any change to it invalidates the sidecar
+            if (manifest is None
+                    or manifest['workbook_size'] != os.path.getsize(file_path)
+                    or manifest['workbook_mtime'] != os.path.getmtime(file_path)):
+                return None
             
-            # Map of expected sheet names
-            sheet_mapping = {
-                'September': 'September Expenses',
-                'October': 'October Expenses',
-                'November': 'November Expenses'
+            return {month: self._read_sidecar_month(sidecar_dir, i) for i, month in enumerate(manifest['months'])}
+        except Exception:
+            return None
+    
+    def load_sidecar_sheets(self, file_path, fingerprints):
+        """{sheet name: month data} from a stale sidecar for the sheets whose fingerprint is unchanged"""
+        if not fingerprints:
+            return {}
+        sidecar_dir = self._sidecar_dir(file_path)
+        try:
+            manifest = self._read_sidecar_manifest(sidecar_dir)
+            if manifest is None:
+                return {}
+            return {
+                sheet_name: self._read_sidecar_month(sidecar_dir, i)
+                for i, (sheet_name, fingerprint) in enumerate(zip(manifest['sheets'], manifest['fingerprints']))
+                if fingerprint is not None and fingerprints.get(sheet_name) == fingerprint
             }
+        except Exception:
+            return {}
+    
+    def write_sidecar(self, file_path, parsed_data, workbook_state=None):
+        """Write parsed month frames to a Feather sidecar next to the workbook
+        
+        workbook_state is the workbook_state() taken before parsing; its sheet
+        fingerprints let a later load reuse the months whose sheet did not change.
+        """
+        if workbook_state is None:
+            workbook_state = self.workbook_state(file_path)
+        fingerprints = workbook_state['fingerprints'] or {}
+        # parse_excel_data labels months the same way, so this recovers each month's sheet
+        month_sheets = dict(excel_parser.discover_month_sheets(fingerprints.keys()))
+        sheets = [month_sheets.get(month) for month in parsed_data]
+        sheet_fingerprints = [fingerprints.get(sheet_name) for sheet_name in sheets]
+        sidecar_dir = self._sidecar_dir(file_path)
+        tmp_dir = f"{sidecar_dir}.{os.getpid()}.tmp"
+        old_dir = f"{sidecar_dir}.{os.getpid()}.old"
+        
+        # Months whose sheet is unchanged keep their existing files, so a one-sheet edit rewrites one month
+        unchanged = {}
+        try:
+            manifest = self._read_sidecar_manifest(sidecar_dir)
+            if manifest is not None:
+                unchanged = {
+                    (sheet_name, fingerprint): i
+                    for i, (sheet_name, fingerprint) in enumerate(zip(manifest['sheets'], manifest['fingerprints']))
+                    if fingerprint is not None
+                }
+        except Exception:
+            pass
+        
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            for i, month_data in enumerate(parsed_data.values()):
+                previous = unchanged.get((sheets[i], sheet_fingerprints[i])) if sheet_fingerprints[i] else None
+                for section in self.SECTIONS:
+                    target = os.path.join(tmp_dir, f"{i}_{section}.feather")
+                    if previous is not None:
+                        try:
+                            os.link(os.path.join(sidecar_dir, f"{previous}_{section}.feather"), target)
+                            continue
+                        except OSError:
+                            pass
+                    month_data[section].reset_index(drop=True).to_feather(target, compression='uncompressed')
+            with open(os.path.join(tmp_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'parser_version': self.PARSER_VERSION,
+                    'workbook_size': workbook_state['size'],
+                    'workbook_mtime': workbook_state['mtime'],
+                    'months': list(parsed_data.keys()),
+                    'sheets': sheets,
+                    'fingerprints': sheet_fingerprints
+                }, f)
             
-            for month, sheet_name in sheet_mapping.items():
-                try:
-                    if sheet_name in excel_data:
-                        df = excel_data[sheet_name]
-                        st.sidebar.info(f"🔍 Processing {month}: {df.shape[0]} rows x {df.shape[1]} columns")
-                        
-                        # Find section markers by scanning all rows
-                        feed_end = None
-                        expense_start = None
-                        expense_end = None
-                        individual_start = None
-                        
-                        for idx in range(len(df)):
-                            row_str = ' '.join([str(val).lower() for val in df.iloc[idx].values if pd.notna(val)])
-                            
-                            # Look for expenses section - it usually has "Ratio" and "Tonne" in the same row
-                            if 'ratio' in row_str and 'tonne' in row_str:
-                                if feed_end is None:  # First time we see this marks end of feed section
-                                    feed_end = idx - 1  # One row before the header
-                                    expense_start = idx - 1  # Start of expense section
-                                st.sidebar.success(f"✓ Found expense header (Ratio/Tonne) at row {idx}")
-                            
-                            # Look for breakdown section
-                            if 'breakdown' in row_str and 'expenses' in row_str:
-                                expense_end = idx
-                                individual_start = idx
-                                st.sidebar.success(f"✓ Found breakdown section at row {idx}")
-                            
-                            # Alternative: Look for Yami/Mike/Kali header row
-                            if 'yami' in row_str and 'mike' in row_str and individual_start is None:
-                                if expense_end is None:
-                                    expense_end = idx - 1
-                                individual_start = idx - 1
-                                st.sidebar.success(f"✓ Found Yami/Mike/Kali header at row {idx}")
-                        
-                        # If we didn't find feed_end but found expense_start, set feed_end
-                        if feed_end is None and expense_start is not None:
-                            feed_end = expense_start
-                        
-                        st.sidebar.info(f"📍 Sections: Feed(0-{feed_end}), Expense({expense_start}-{expense_end}), Individual({individual_start}+)")
-                        
-                        # === PARSE FEED DATA ===
-                        if feed_end is not None and feed_end > 1:
-                            feed_section = df.iloc[:feed_end].copy()
-                            st.sidebar.info(f"📊 Feed section: rows 0 to {feed_end}")
-                            
-                            # Find header row - look for "Category" column
-                            header_row_idx = None
-                            category_col_idx = None
-                            total_kg_col_idx = None
-                            
-                            for idx in range(min(10, len(feed_section))):  # Check first 10 rows
-                                row = feed_section.iloc[idx]
-                                for col_idx, val in enumerate(row.values):
-                                    if pd.notna(val) and str(val).strip().lower() == 'category':
-                                        header_row_idx = idx
-                                        category_col_idx = col_idx
-                                        # Find Total (kg) column - usually the last column
-                                        for search_idx in range(len(row) - 1, -1, -1):
-                                            search_val = str(row.iloc[search_idx]).lower()
-                                            if 'total' in search_val and 'kg' in search_val:
-                                                total_kg_col_idx = search_idx
-                                                break
-                                        break
-                                if header_row_idx is not None:
-                                    break
-                            
-                            if header_row_idx is not None and category_col_idx is not None:
-                                st.sidebar.success(f"✓ Found feed header at row {header_row_idx}, Category: col {category_col_idx}, Total kg: col {total_kg_col_idx}")
-                                
-                                # If Total kg column not found, use last column
-                                if total_kg_col_idx is None:
-                                    total_kg_col_idx = len(feed_section.columns) - 1
-                                    st.sidebar.info(f"Using last column ({total_kg_col_idx}) for Total kg")
-                                
-                                # Extract data rows (after header, before feed_end)
-                                feed_data = feed_section.iloc[header_row_idx + 1:].copy()
-                                feed_data = feed_data.dropna(how='all').reset_index(drop=True)
-                                
-                                feed_records = []
-                                for idx, row in feed_data.iterrows():
-                                    # Skip Grand Total rows
-                                    first_cell = str(row.iloc[0]).lower() if pd.notna(row.iloc[0]) else ""
-                                    if 'grand total' in first_cell:
-                                        continue
-                                    
-                                    # Get category and total kg
-                                    category = row.iloc[category_col_idx] if category_col_idx < len(row) else None
-                                    total_kg = row.iloc[total_kg_col_idx] if total_kg_col_idx < len(row) else None
-                                    
-                                    if pd.notna(category) and str(category).strip():
-                                        try:
-                                            total_kg_val = float(total_kg) if pd.notna(total_kg) else 0
-                                            category_str = str(category).strip()
-                                            
-                                            feed_records.append({
-                                                'Category': category_str,
-                                                'Total_kg': total_kg_val
-                                            })
-                                        except (ValueError, TypeError) as e:
-                                            st.sidebar.warning(f"⚠️ Skipped feed row {idx}: {e}")
-                                            continue
-                                
-                                feed_df = pd.DataFrame(feed_records)
-                                st.sidebar.success(f"✅ Parsed {len(feed_df)} feed items: {', '.join(feed_df['Category'].head(3).tolist())}...")
-                            else:
-                                st.sidebar.warning(f"⚠️ Could not find feed header (Category column)")
-                                feed_df = pd.DataFrame(columns=['Category', 'Total_kg'])
-                        else:
-                            st.sidebar.warning(f"⚠️ Feed section too small or not found (feed_end={feed_end})")
-                            feed_df = pd.DataFrame(columns=['Category', 'Total_kg'])
-                        
-                        # === PARSE EXPENSES DATA ===
-                        if expense_start is not None and expense_end is not None:
-                            expense_section = df.iloc[expense_start:expense_end].copy()
-                            st.sidebar.info(f"💰 Expense section: rows {expense_start} to {expense_end}")
-                            
-                            # Find header row (contains Ratio/Tonne)
-                            header_row_idx = None
-                            for idx in range(len(expense_section)):
-                                row = expense_section.iloc[idx]
-                                for val in row.values:
-                                    if pd.notna(val):
-                                        val_str = str(val).lower()
-                                        if 'ratio' in val_str and 'tonne' in val_str:
-                                            header_row_idx = idx
-                                            break
-                                if header_row_idx is not None:
-                                    break
-                            
-                            if header_row_idx is not None:
-                                st.sidebar.success(f"✓ Found expense header at row {header_row_idx}")
-                                
-                                expense_data = expense_section.iloc[header_row_idx + 1:].copy()
-                                expense_data = expense_data.dropna(how='all').reset_index(drop=True)
-                                
-                                expense_records = []
-                                for idx, row in expense_data.iterrows():
-                                    item = row.iloc[0]  # First column is item name
-                                    
-                                    if pd.notna(item) and str(item).strip():
-                                        # Find last numeric column (Total Cost)
-                                        total_cost = None
-                                        for col_idx in range(len(row)-1, -1, -1):
-                                            try:
-                                                val = float(row.iloc[col_idx])
-                                                if pd.notna(val) and val > 0:
-                                                    total_cost = val
-                                                    break
-                                            except (ValueError, TypeError):
-                                                continue
-                                        
-                                        if total_cost is not None:
-                                            expense_records.append({
-                                                'Item': str(item).strip(),
-                                                'Total_Cost': total_cost
-                                            })
-                                
-                                expense_df = pd.DataFrame(expense_records)
-                                st.sidebar.success(f"✅ Parsed {len(expense_df)} expense items, Total: ${expense_df['Total_Cost'].sum():.2f}")
-                            else:
-                                st.sidebar.warning("⚠️ Could not find expense header row")
-                                expense_df = pd.DataFrame(columns=['Item', 'Total_Cost'])
-                        else:
-                            st.sidebar.warning("⚠️ Could not find expense section")
-                            expense_df = pd.DataFrame(columns=['Item', 'Total_Cost'])
-                        
-                        # === PARSE INDIVIDUAL CONTRIBUTIONS ===
-                        if individual_start is not None:
-                            individual_section = df.iloc[individual_start:].copy()
-                            st.sidebar.info(f"👥 Individual section: rows {individual_start} onwards")
-                            
-                            # Find header row with Yami, Mike, Kali
-                            header_row_idx = None
-                            yami_col_idx = None
-                            mike_col_idx = None
-                            kali_col_idx = None
-                            
-                            for idx in range(len(individual_section)):
-                                row = individual_section.iloc[idx]
-                                
-                                for col_idx, val in enumerate(row.values):
-                                    if pd.notna(val):
-                                        val_str = str(val).strip().lower()
-                                        if val_str == 'yami':
-                                            yami_col_idx = col_idx
-                                            header_row_idx = idx
-                                        elif val_str == 'mike':
-                                            mike_col_idx = col_idx
-                                        elif val_str == 'kali':
-                                            kali_col_idx = col_idx
-                                
-                                if yami_col_idx is not None and mike_col_idx is not None:
-                                    break
-                            
-                            if header_row_idx is not None and yami_col_idx is not None and mike_col_idx is not None:
-                                st.sidebar.success(f"✓ Found individual header at row {header_row_idx}")
-                                st.sidebar.info(f"📍 Yami: col {yami_col_idx}, Mike: col {mike_col_idx}, Kali: col {kali_col_idx if kali_col_idx else 'N/A'}")
-                                
-                                individual_data = individual_section.iloc[header_row_idx + 1:].copy()
-                                individual_data = individual_data.dropna(how='all').reset_index(drop=True)
-                                
-                                individual_records = []
-                                for idx, row in individual_data.iterrows():
-                                    category = row.iloc[0]
-                                    
-                                    if pd.notna(category):
-                                        category_str = str(category).strip()
-                                        # Skip if it's just numbers (totals row)
-                                        if category_str and not category_str.replace('.','').replace(',','').isdigit():
-                                            try:
-                                                yami_val = 0
-                                                mike_val = 0
-                                                kali_val = 0
-                                                
-                                                if yami_col_idx is not None and yami_col_idx < len(row):
-                                                    yami_val = float(row.iloc[yami_col_idx]) if pd.notna(row.iloc[yami_col_idx]) else 0
-                                                
-                                                if mike_col_idx is not None and mike_col_idx < len(row):
-                                                    mike_val = float(row.iloc[mike_col_idx]) if pd.notna(row.iloc[mike_col_idx]) else 0
-                                                
-                                                if kali_col_idx is not None and kali_col_idx < len(row):
-                                                    kali_val = float(row.iloc[kali_col_idx]) if pd.notna(row.iloc[kali_col_idx]) else 0
-                                                
-                                                individual_records.append({
-                                                    'Category': category_str,
-                                                    'Yami': yami_val,
-                                                    'Mike': mike_val,
-                                                    'Kali': kali_val
-                                                })
-                                            except (ValueError, TypeError, IndexError) as e:
-                                                st.sidebar.warning(f"⚠️ Skipped individual row {idx} ({category_str}): {str(e)}")
-                                                continue
-                                
-                                individual_df = pd.DataFrame(individual_records)
-                                yami_total = individual_df['Yami'].sum()
-                                mike_total = individual_df['Mike'].sum()
-                                kali_total = individual_df['Kali'].sum()
-                                st.sidebar.success(f"✅ Parsed {len(individual_df)} contributions - Yami: ${yami_total:.2f}, Mike: ${mike_total:.2f}, Kali: ${kali_total:.2f}")
-                            else:
-                                st.sidebar.warning("⚠️ Could not find individual header row")
-                                individual_df = pd.DataFrame(columns=['Category', 'Yami', 'Mike', 'Kali'])
-                        else:
-                            st.sidebar.warning("⚠️ Could not find individual section")
-                            individual_df = pd.DataFrame(columns=['Category', 'Yami', 'Mike', 'Kali'])
-                        
-                        # Store parsed data if we have any valid data
-                        if not feed_df.empty or not expense_df.empty or not individual_df.empty:
-                            parsed_data[month] = {
-                                'feed': feed_df,
-                                'expenses': expense_df,
-                                'individuals': individual_df
-                            }
-                            st.sidebar.success(f"✅✅✅ Successfully loaded {month} data!")
-                        else:
-                            st.sidebar.error(f"❌ No valid data found for {month}")
-                    else:
-                        st.sidebar.warning(f"⚠️ Sheet '{sheet_name}' not found in Excel file")
-                        
-                except Exception as month_error:
-                    st.sidebar.error(f"❌ Error parsing {month}: {str(month_error)}")
-                    import traceback
-                    st.sidebar.code(traceback.format_exc(), language='python')
-                    continue
-            
-            # Return parsed data or fallback
-            if parsed_data:
-                st.sidebar.success(f"🎉 Successfully loaded {len(parsed_data)} month(s) from Excel!")
-                
-                # Fill missing months with empty structures
-                for month in ['September', 'October', 'November']:
-                    if month not in parsed_data:
-                        parsed_data[month] = {
-                            'feed': pd.DataFrame(columns=['Category', 'Total_kg']),
-                            'expenses': pd.DataFrame(columns=['Item', 'Total_Cost']),
-                            'individuals': pd.DataFrame(columns=['Category', 'Yami', 'Mike', 'Kali'])
-                        }
-                        st.sidebar.info(f"ℹ️ No data found for {month}")
-                
-                return parsed_data
-            else:
-                st.sidebar.error("❌ No valid data found - using default data")
-                return self.load_default_data()
-                
+            # Swap the complete directory in; readers that race us just fall back to Excel
+            if os.path.exists(sidecar_dir):
+                os.replace(sidecar_dir, old_dir)
+            os.replace(tmp_dir, sidecar_dir)
         except Exception as e:
-            st.sidebar.error(f"❌ Critical error parsing Excel: {str(e)}")
-            import traceback
-            st.sidebar.code(traceback.format_exc(), language='python')
-            return self.load_default_data()
-        """Parse Excel data from backend file"""
+            st.sidebar.warning(f"⚠️ Could not write Feather sidecar: {e}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            shutil.rmtree(old_dir, ignore_errors=True)
+    
+    def parse_excel_data(self, file_path, fallback=True, reuse=None, streaming=None):
+        """Parse Excel data from standardized sheet structure and show the parser's report in the sidebar
+        
+        reuse and streaming are passed to excel_parser.parse_workbook.
+        On failure returns the default data, or None when fallback is False.
+        """
         try:
-            excel_data = pd.read_excel(file_path, sheet_name=None)
-            return self.load_default_data()
+            parsed_data, report = excel_parser.parse_workbook(file_path, reuse=reuse, streaming=streaming)
         except Exception as e:
-            st.error(f"Error parsing Excel: {e}")
-            return self.load_default_data()
+            st.sidebar.error(f"❌ Critical error: {str(e)}")
+            st.sidebar.code(traceback.format_exc(), language='python')
+            return self.load_default_data() if fallback else None
+        
+        self.show_parse_report(report)
+        
+        if parsed_data:
+            st.sidebar.success(f"🎉 Successfully loaded {len(parsed_data)} month(s)!")
+            return parsed_data
+        st.sidebar.error("❌ No valid data - using fallback")
+        return self.load_default_data() if fallback else None
+    
+    def show_parse_report(self, report):
+        """Render the messages excel_parser.parse_workbook collected"""
+        for level, text in report['messages']:
+            if level == 'code':
+                st.sidebar.code(text, language='python')
+            else:
+                getattr(st.sidebar, level)(text)
     
     def load_default_data(self):
         """Load default data structure"""
+        self.data_source = "default"
         september_feed = pd.DataFrame({
             'Category': ['Pig 1 Pregnant', 'Pig 2 Pregnant', 'Dry Sow(2)', 'Weaners (20)'],
             'Daily_Consumption_kg': [2, 2, 4, 10],
@@ -1056,111 +1169,165 @@ class CasaDeFoAnalyzer:
             'Kali': [0, 0, 0, 0, 0, 0, 100, 50]
         })
         
+        contributors = ['Yami', 'Mike', 'Kali']
         return {
             'September': {
                 'feed': september_feed, 
                 'expenses': september_expenses,
-                'individuals': september_individuals
+                'individuals': excel_parser.long_contributions(
+                    september_individuals['Category'], contributors, september_individuals[contributors]
+                )
             },
             'October': {
                 'feed': october_feed, 
                 'expenses': october_expenses,
-                'individuals': october_individuals
+                'individuals': excel_parser.long_contributions(
+                    october_individuals['Category'], contributors, october_individuals[contributors]
+                )
             },
             'November': {
                 'feed': november_feed, 
                 'expenses': november_expenses,
-                'individuals': november_individuals
+                'individuals': excel_parser.long_contributions(
+                    november_individuals['Category'], contributors, november_individuals[contributors]
+                )
             }
         }
     
+    @memoized_aggregate
     def get_summary_metrics(self):
-        total_expenses = {}
-        total_feed = {}
-        
-        for month, data in self.data.items():
-            total_expenses[month] = data['expenses']['Total_Cost'].sum()
-            total_feed[month] = data['feed']['Total_kg'].sum()
+        total_expenses = self.facts['expenses'].groupby('Month', observed=False)['Total_Cost'].sum()
+        total_feed = self.facts['feed'].groupby('Month', observed=False)['Total_kg'].sum()
         
-        return total_expenses, total_feed
+        return total_expenses.to_dict(), total_feed.to_dict()
     
+    @memoized_aggregate
     def get_expense_breakdown(self):
-        expense_categories = {}
-        
-        for month, data in self.data.items():
-            for _, row in data['expenses'].iterrows():
-                category = row['Item']
-                cost = row['Total_Cost']
-                
-                if category not in expense_categories:
-                    expense_categories[category] = {}
-                expense_categories[category][month] = cost
-        
-        expense_df = pd.DataFrame(expense_categories).T.fillna(0)
-        return expense_df
+        expense_df = self.facts['expenses'].pivot_table(
+            index='Item', columns='Month', values='Total_Cost',
+            aggfunc='sum', fill_value=0, observed=True
+        )
+        # Plain labels so callers can reset_index()/melt without categorical surprises
+        expense_df.index = expense_df.index.astype(str)
+        expense_df.columns = expense_df.columns.astype(str)
+        return expense_df.rename_axis(index=None, columns=None)
     
+    @memoized_aggregate
     def get_feed_analysis(self):
-        feed_data = []
-        
-        for month, data in self.data.items():
-            for _, row in data['feed'].iterrows():
-                feed_data.append({
-                    'Month': month,
-                    'Category': row['Category'],
-                    'Total_kg': row['Total_kg']
-                })
+        return self.facts['feed'][['Month', 'Category', 'Total_kg']].copy()
+    
+    @memoized_aggregate
+    def get_feed_efficiency(self, feed_items):
+        """Feed cost, feed kg and cost per kg for every month"""
+        expenses = self.facts['expenses']
+        feed_cost = (
+            expenses[expenses['Item'].astype(str).isin(feed_items)]
+            .groupby('Month', observed=False)['Total_Cost'].sum()
+        )
+        total_feed = self.facts['feed'].groupby('Month', observed=False)['Total_kg'].sum()
         
-        return pd.DataFrame(feed_data)
+        efficiency_df = pd.DataFrame({'Feed_Cost': feed_cost, 'Total_Feed_kg': total_feed})
+        efficiency_df['Cost_per_kg'] = (
+            efficiency_df['Feed_Cost'] / efficiency_df['Total_Feed_kg'].where(efficiency_df['Total_Feed_kg'] > 0)
+        ).fillna(0.0)
+        return efficiency_df.rename_axis('Month').reset_index()
     
+    @memoized_aggregate
+    def get_contributors(self):
+        """Contributor names in the order they first appear in the workbooks"""
+        return [str(name) for name in self.facts['individuals']['Contributor'].cat.categories]
+    
+    @memoized_aggregate
     def get_individual_contributions(self):
-        individual_data = []
-        
-        for month, data in self.data.items():
-            individuals = data['individuals']
-            for _, row in individuals.iterrows():
-                individual_data.append({
-                    'Month': month,
-                    'Category': row['Category'],
-                    'Yami': row['Yami'],
-                    'Mike': row['Mike'],
-                    'Kali': row['Kali']
-                })
-        
-        return pd.DataFrame(individual_data)
+        """Month x Category rows with one amount column per contributor"""
+        individuals = self.facts['individuals']
+        # Keep merged sites apart so the same category from two workbooks stays on two rows
+        index = ['Month'] + [col for col in ('Site',) if col in individuals.columns] + ['Category']
+        contributions = individuals.pivot_table(
+            index=index, columns='Contributor', values='Amount',
+            aggfunc='sum', fill_value=0, observed=True, sort=False
+        )
+        contributions.columns = contributions.columns.astype(str)
+        contributions = contributions.rename_axis(columns=None).reset_index()
+        contributions[index] = contributions[index].astype(str)
+        return contributions
     
+    @memoized_aggregate
     def get_individual_totals(self):
-        individual_totals = {
-            'Yami': 0,
-            'Mike': 0,
-            'Kali': 0
-        }
-        
-        for month, data in self.data.items():
-            individuals = data['individuals']
-            individual_totals['Yami'] += individuals['Yami'].sum()
-            individual_totals['Mike'] += individuals['Mike'].sum()
-            individual_totals['Kali'] += individuals['Kali'].sum()
-        
-        return individual_totals
+        totals = self.facts['individuals'].groupby('Contributor', observed=True)['Amount'].sum()
+        return {str(name): amount for name, amount in totals.items()}
     
+    @memoized_aggregate
     def get_individual_monthly_totals(self):
-        monthly_totals = []
-        
-        for month, data in self.data.items():
-            individuals = data['individuals']
-            monthly_totals.append({
-                'Month': month,
-                'Yami': individuals['Yami'].sum(),
-                'Mike': individuals['Mike'].sum(),
-                'Kali': individuals['Kali'].sum()
-            })
-        
-        return pd.DataFrame(monthly_totals)
+        """Long (Month, Contributor, Amount) totals, one row per month and contributor"""
+        return (
+            self.facts['individuals']
+            .groupby(['Month', 'Contributor'], observed=False)['Amount'].sum()
+            .reset_index()
+        )
+
+class QueryCache:
+    """Bounded LRU of rag_search results with a time-to-live, shared by every session
+    
+    Entries belong to one knowledge base index version; the first lookup against a
+    newer index drops them all. Cached results are shared, so treat them as read-only.
+    """
+    
+    def __init__(self, max_entries=256, ttl=3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.index_version = None
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(query):
+        """Lowercase and collapse whitespace, exactly as rag_search tokenizes, so hits match a fresh search"""
+        return " ".join(query.lower().split())
+    
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+    
+    def search(self, knowledge_base, query, top_k=5, ranker="keyword"):
+        """knowledge_base.rag_search(query, top_k, ranker), answered from the cache when possible"""
+        key = (self.normalize(query), top_k, ranker)
+        with self._lock:
+            if knowledge_base.index_version != self.index_version:
+                if self.index_version is not None:
+                    self.stats['invalidations'] += 1
+                self._entries.clear()
+                self.index_version = knowledge_base.index_version
+            
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, results = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return results
+                del self._entries[key]
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+        
+        # Search outside the lock so a slow query never blocks other sessions' hits
+        results = knowledge_base.rag_search(query, top_k=top_k, ranker=ranker)
+        with self._lock:
+            if knowledge_base.index_version == self.index_version:
+                self._entries[key] = (time.monotonic(), results)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+        return results
 
 class CasaDeFoChatbot:
-    def __init__(self, analyzer, knowledge_base):
+    def __init__(self, analyzer, knowledge_base, query_cache=None):
         self.analyzer = analyzer
         self.knowledge_base = knowledge_base
+        # Optional QueryCache for repeated RAG questions
+        self.query_cache = query_cache
     
     def get_response(self, user_input):
         """Generate comprehensive response using RAG architecture"""
@@ -1171,17 +1338,24 @@ class CasaDeFoChatbot:
         
         if any(word in user_input for word in ['expense', 'cost', 'spending', 'money']):
             total_cost = sum(total_expenses.values())
-            return self.format_project_response(f"The total expenses for the last 3 months are ${total_cost:,.2f}. September: ${total_expenses['September']:,.2f}, October: ${total_expenses['October']:,.2f}, November: ${total_expenses['November']:,.2f}.")
+            monthly = ", ".join(f"{month}: ${cost:,.2f}" for month, cost in total_expenses.items())
+            return self.format_project_response(f"The total expenses for the last {len(total_expenses)} months are ${total_cost:,.2f}. {monthly}.")
         
         elif any(word in user_input for word in ['feed', 'consumption', 'kg', 'kilos']):
             total_kg = sum(total_feed.values())
-            return self.format_project_response(f"Total feed consumption over 3 months is {total_kg:,.0f} kg. The highest consumption was in November with {total_feed['November']:,.0f} kg.")
-        
-        elif any(word in user_input for word in ['yami', 'mike', 'kali', 'individual', 'contribution', 'who leads', 'who contributed']):
+            if not total_feed:
+                return self.format_project_response("No feed records have been loaded yet.")
+            peak_month = max(total_feed, key=total_feed.get)
+            return self.format_project_response(f"Total feed consumption over {len(total_feed)} months is {total_kg:,.0f} kg. The highest consumption was in {peak_month} with {total_feed[peak_month]:,.0f} kg.")
+        
+        elif any(word in user_input for word in [name.lower() for name in individual_totals] + ['individual', 'contribution', 'who leads', 'who contributed']):
+            if not individual_totals:
+                return self.format_project_response("No individual contributions have been loaded yet.")
             max_contributor = max(individual_totals, key=individual_totals.get)
             max_amount = individual_totals[max_contributor]
             
-            response = f"Individual contributions: Yami: ${individual_totals['Yami']:,.2f}, Mike: ${individual_totals['Mike']:,.2f}, Kali: ${individual_totals['Kali']:,.2f}. {max_contributor} has contributed the most so far with ${max_amount:,.2f}."
+            breakdown = ", ".join(f"{name}: ${amount:,.2f}" for name, amount in individual_totals.items())
+            response = f"Individual contributions: {breakdown}. {max_contributor} has contributed the most so far with ${max_amount:,.2f}."
             return self.format_project_response(response)
         
         elif any(word in user_input for word in ['pig', 'swine', 'hog', 'breed', 'disease', 'housing', 'feeding', 'farm', 'management']):
@@ -1195,7 +1369,12 @@ class CasaDeFoChatbot:
 
     def handle_rag_query(self, query):
         """Handle queries using RAG architecture"""
-        results = self.knowledge_base.rag_search(query, top_k=5)
+        # Embedding similarity when a local model is loaded, keyword matching otherwise
+        ranker = "dense" if self.knowledge_base.dense_index is not None else "keyword"
+        if self.query_cache is not None:
+            results = self.query_cache.search(self.knowledge_base, query, top_k=5, ranker=ranker)
+        else:
+            results = self.knowledge_base.rag_search(query, top_k=5, ranker=ranker)
         
         if results:
             formatted_response = "## 🔍 RAG-Powered Response\n\n"
@@ -1223,23 +1402,190 @@ class CasaDeFoChatbot:
         """Format general responses"""
         return text
 
+def get_manuals_fingerprint(data_folder="data"):
+    """(name, size, mtime) of every manual PDF; changes whenever a manual is added, edited or removed"""
+    pdf_files = glob.glob(os.path.join(data_folder, "manuals", "*.pdf"))
+    return tuple(sorted(
+        (os.path.basename(pdf_file), os.path.getsize(pdf_file), os.path.getmtime(pdf_file))
+        for pdf_file in pdf_files
+    ))
+
+def get_workbook_fingerprint():
+    """(path, size, mtime) of every Excel workbook; changes whenever a workbook is saved"""
+    return tuple(sorted(
+        (excel_file, os.path.getsize(excel_file), os.path.getmtime(excel_file))
+        for excel_file in glob.glob("data/excel/*.xlsx")
+    ))
+
+@st.cache_data(show_spinner=False)
+def load_workbook_data(file_path, file_size, file_mtime):
+    """Parsed month data for one workbook, cached per (path, size, mtime)"""
+    return CasaDeFoAnalyzer(data={}).load_workbook(file_path)
+
+def load_cached_workbook(file_path):
+    """Workbook loader that only parses workbooks whose size or mtime changed"""
+    return load_workbook_data(file_path, os.path.getsize(file_path), os.path.getmtime(file_path))
+
+class DataWatcher:
+    """Keeps the analyzer and knowledge base current by polling data/excel and data/manuals
+    
+    A daemon thread rebuilds whichever of the two changed and swaps the new
+    instance in under a lock, so reruns never wait on a reload: they keep using
+    the last complete analyzer or knowledge base until the replacement is ready.
+    Both are read-only once built, so sessions can share them. Neither is built
+    until a tab needs it, so the Overview never waits on the manual index.
+    """
+    
+    def __init__(self, data_folder="data", interval=5.0):
+        self.data_folder = data_folder
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._force = set()
+        self.reloading = set()
+        self.status = {}
+        
+        # Nothing is built until a tab asks for it, see ensure()
+        self._build_lock = threading.Lock()
+        self.workbook_fingerprint = None
+        self.manuals_fingerprint = None
+        self.analyzer = None
+        self.knowledge_base = None
+        # Last fingerprint seen per built source; a change is only acted on once it stops changing
+        self._seen = {}
+        self._failed = {}
+        
+        self._thread = threading.Thread(target=self._run, name="casadefo-data-watcher", daemon=True)
+        self._thread.start()
+    
+    def snapshot(self):
+        """(analyzer, knowledge base) currently installed; use one snapshot for a whole rerun
+        
+        Either is None until ensure() has built it.
+        """
+        with self._lock:
+            return self.analyzer, self.knowledge_base
+    
+    def missing(self, sources):
+        """The given sources that have not been built yet"""
+        with self._lock:
+            return [source for source in sources if source not in self._seen]
+    
+    def ensure(self, sources):
+        """Build any of the given sources that no tab has needed so far"""
+        for source in sources:
+            # One build per source even when several sessions ask at once
+            with self._build_lock:
+                if not self.missing([source]):
+                    continue
+                if source == 'excel':
+                    fingerprint = get_workbook_fingerprint()
+                    analyzer = CasaDeFoAnalyzer(workbook_loader=load_cached_workbook)
+                    with self._lock:
+                        self.analyzer, self.workbook_fingerprint = analyzer, fingerprint
+                        self._seen[source] = fingerprint
+                else:
+                    fingerprint = get_manuals_fingerprint(self.data_folder)
+                    knowledge_base = RAGKnowledgeBase(self.data_folder)
+                    with self._lock:
+                        self.knowledge_base, self.manuals_fingerprint = knowledge_base, fingerprint
+                        self._seen[source] = fingerprint
+    
+    def request_reload(self, sources=('excel', 'manuals')):
+        """Rebuild the given sources on the watcher thread even if their files look unchanged"""
+        with self._lock:
+            self._force.update(sources)
+        self._wake.set()
+    
+    def stop(self):
+        """End the polling thread after any rebuild in progress; the watcher is not restarted"""
+        self._stop.set()
+        self._wake.set()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.check()
+    
+    def check(self):
+        """Rebuild and swap in any source whose files changed and have settled since the last poll"""
+        with self._lock:
+            forced, self._force = self._force, set()
+        
+        sources = {
+            'excel': (get_workbook_fingerprint, self._rebuild_analyzer),
+            'manuals': (lambda: get_manuals_fingerprint(self.data_folder), self._rebuild_knowledge_base)
+        }
+        for source, (fingerprint_of, rebuild) in sources.items():
+            # Sources no tab has asked for yet are built fresh by ensure() instead
+            if self.missing([source]):
+                continue
+            fingerprint = None
+            try:
+                fingerprint = fingerprint_of()
+                current = self.workbook_fingerprint if source == 'excel' else self.manuals_fingerprint
+                # Files still being written show a different fingerprint on every poll
+                settled = fingerprint == self._seen[source]
+                self._seen[source] = fingerprint
+                changed = fingerprint != current and fingerprint != self._failed.get(source)
+                if source in forced or (settled and changed):
+                    self.reloading.add(source)
+                    rebuild(fingerprint)
+                    self._failed.pop(source, None)
+                    self.status[source] = {'reloaded_at': time.time(), 'error': None}
+            except Exception as e:
+                # Keep serving the previous version; the next change or refresh retries
+                self._failed[source] = fingerprint
+                self.status[source] = {'reloaded_at': None, 'error': str(e)}
+            finally:
+                self.reloading.discard(source)
+    
+    def _rebuild_analyzer(self, fingerprint):
+        analyzer = CasaDeFoAnalyzer(workbook_loader=load_cached_workbook)
+        if fingerprint and analyzer.data_source != "excel":
+            raise ValueError("no workbook could be parsed, keeping the previous data")
+        with self._lock:
+            self.analyzer, self.workbook_fingerprint = analyzer, fingerprint
+    
+    def _rebuild_knowledge_base(self, fingerprint):
+        knowledge_base = RAGKnowledgeBase(self.data_folder)
+        with self._lock:
+            self.knowledge_base, self.manuals_fingerprint = knowledge_base, fingerprint
+
+@st.cache_resource(show_spinner=False)
+def get_query_cache():
+    """The process-wide RAG query cache, shared by every session"""
+    return QueryCache()
+
+# Clearing the resource cache replaces the watcher, so the old one's thread has to stop
+@st.cache_resource(show_spinner=False, on_release=DataWatcher.stop)
+def get_data_watcher():
+    """The process-wide DataWatcher, started on the first run"""
+    return DataWatcher()
+
+# Data each tab reads: 'excel' is the analyzer, 'manuals' the RAG knowledge base
+TAB_SOURCES = {
+    "Overview": ('excel',),
+    "Monthly Analysis": ('excel',),
+    "Feed Consumption": ('excel',),
+    "Expense Breakdown": ('excel',),
+    "Individual Contributions": ('excel',),
+    "Recommendations": ('excel',),
+    "Chatbot": ('excel', 'manuals')
+}
+SOURCE_LABELS = {'excel': "project data", 'manuals': "RAG knowledge base"}
+
 def main():
     st.markdown('<h1 class="main-header">🏠 CasaDeFo Analytics</h1>', unsafe_allow_html=True)
     
     # Add refresh button at the top
     col1, col2, col3 = st.columns([1, 2, 1])
     with col3:
-        if st.button("🔄 Refresh Data", use_container_width=True):
-            st.cache_data.clear()
-            st.rerun()
-    
-    if 'knowledge_base' not in st.session_state:
-        with st.spinner("🔄 Loading RAG knowledge base..."):
-            st.session_state.knowledge_base = RAGKnowledgeBase()
-    
-    # Always reload analyzer to get latest Excel data
-    analyzer = CasaDeFoAnalyzer()
-    chatbot = CasaDeFoChatbot(analyzer, st.session_state.knowledge_base)
+        refresh = st.button("🔄 Refresh Data", use_container_width=True)
     
     st.sidebar.markdown("### 📊 Navigation")
     
@@ -1260,6 +1606,21 @@ def main():
         if st.sidebar.button(display_name, key=tab_name, use_container_width=True):
             st.session_state.active_tab = tab_name
     
+    # New workbooks and manuals are picked up in the background; reruns never wait for a reload
+    watcher = get_data_watcher()
+    if refresh:
+        # Re-read the workbooks through their sidecars, which only re-parse sheets whose
+        # fingerprints changed; the figure cache is left warm
+        load_workbook_data.clear()
+        watcher.request_reload()
+        st.toast("🔄 Reloading data in the background...")
+    # Only build what the active tab reads; the manual index waits for the RAG Assistant
+    missing = watcher.missing(TAB_SOURCES[st.session_state.active_tab])
+    if missing:
+        with st.spinner(f"🔄 Loading {' and '.join(SOURCE_LABELS[source] for source in missing)}..."):
+            watcher.ensure(missing)
+    analyzer, knowledge_base = watcher.snapshot()
+    
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🗂️ Backend Data")
     
@@ -1275,6 +1636,16 @@ def main():
             st.sidebar.markdown(f"   Modified: {mod_time}")
     else:
         st.sidebar.warning("No Excel files found")
+    st.sidebar.caption(
+        f"🧮 Aggregate cache: {analyzer.cache_stats['hits']} hits / {analyzer.cache_stats['misses']} misses"
+    )
+    excel_status = watcher.status.get('excel', {})
+    if 'excel' in watcher.reloading:
+        st.sidebar.caption("⏳ Reloading workbooks...")
+    elif excel_status.get('error'):
+        st.sidebar.caption(f"⚠️ Last reload failed: {excel_status['error']}")
+    elif excel_status.get('reloaded_at'):
+        st.sidebar.caption(f"🔁 Reloaded {datetime.fromtimestamp(excel_status['reloaded_at']).strftime('%H:%M:%S')}")
     
     st.sidebar.markdown("""
     **Expected Structure:**
@@ -1283,9 +1654,11 @@ def main():
     └── [filename].xlsx
         ├── September Expenses
         ├── October Expenses
-        └── November Expenses
+        └── <Month> [Year] Expenses ...
     ```
     
+    One sheet per month, e.g. "January 2026 Expenses".
+    
     **Each sheet contains:**
     - Top: Feed consumption data
     - Middle: Expenses breakdown
@@ -1293,11 +1666,33 @@ def main():
     """)
     
     st.sidebar.markdown("### 📚 Loaded Resources")
-    if st.session_state.knowledge_base.manuals:
-        for manual in st.session_state.knowledge_base.manuals.keys():
+    if knowledge_base is None:
+        # Not indexed yet; list the folder without extracting anything
+        manual_files = sorted(glob.glob(os.path.join("data", "manuals", "*.pdf")))
+        for manual_file in manual_files:
+            st.sidebar.markdown(f'📄 {os.path.basename(manual_file)}')
+        if manual_files:
+            st.sidebar.caption("🧩 Indexed when the RAG Assistant is opened")
+        else:
+            st.sidebar.info("No manuals loaded. Add PDFs to data/manuals/ folder")
+    elif knowledge_base.manuals:
+        for manual in knowledge_base.manuals.keys():
             st.sidebar.markdown(f'📄 {manual}')
+        chunking_stats = knowledge_base.chunking_stats
+        if chunking_stats.get('chunks'):
+            st.sidebar.caption(
+                f"🧩 {chunking_stats['chunks']} chunks from {chunking_stats['words']:,} words "
+                f"({chunking_stats['words_per_sec']:,.0f} words/sec)"
+            )
     else:
         st.sidebar.info("No manuals loaded. Add PDFs to data/manuals/ folder")
+    if knowledge_base is not None:
+        st.sidebar.caption(f"🧠 Dense retrieval: {knowledge_base.dense_status}")
+        query_stats = get_query_cache().stats
+        st.sidebar.caption(
+            f"🔎 Query cache: {get_query_cache().hit_rate():.0%} hit rate "
+            f"({query_stats['hits']} hits / {query_stats['misses']} misses)"
+        )
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🐷 Farm Resources")
@@ -1320,7 +1715,335 @@ def main():
     elif st.session_state.active_tab == "Recommendations":
         display_recommendations(analyzer)
     elif st.session_state.active_tab == "Chatbot":
-        display_chatbot(analyzer, chatbot)
+        display_chatbot(analyzer, CasaDeFoChatbot(analyzer, knowledge_base, get_query_cache()))
+
+# The first three match the original Yami/Mike/Kali colours; further contributors cycle through the rest
+CONTRIBUTOR_COLORS = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#f7b731', '#a55eea', '#26de81', '#fd9644', '#778ca3']
+
+def contributor_colors(names):
+    """Stable colour per contributor name, cycling the palette when there are many"""
+    return {name: CONTRIBUTOR_COLORS[i % len(CONTRIBUTOR_COLORS)] for i, name in enumerate(names)}
+
+def describe_contributors(names):
+    """'Yami, Mike & Kali' for a handful of names, a count for larger teams"""
+    if not names:
+        return "No contributors"
+    if len(names) == 1:
+        return names[0]
+    if len(names) <= 3:
+        return f"{', '.join(names[:-1])} & {names[-1]}"
+    return f"{len(names)} Contributors"
+
+def expense_trend_figure(analyzer):
+    total_expenses, _ = analyzer.get_summary_metrics()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=list(total_expenses.keys()),
+        y=list(total_expenses.values()),
+        mode='lines+markers',
+        name='Monthly Expenses',
+        line=dict(color='#667eea', width=4),
+        marker=dict(size=12, color='#764ba2', line=dict(color='white', width=2)),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)'
+    ))
+    fig.update_layout(
+        template="plotly_white",
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12, color='#2c3e50')
+    )
+    return fig
+
+def team_contributions_figure(analyzer):
+    individual_totals = analyzer.get_individual_totals()
+    labels = list(individual_totals.keys())
+    values = list(individual_totals.values())
+    colors = list(contributor_colors(labels).values())
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=.5,
+        marker_colors=colors,
+        textfont=dict(size=14, color='white'),
+        textinfo='label+percent',
+        hovertemplate='<b>%{label}</b><br>$%{value:,.0f}<br>%{percent}<extra></extra>'
+    )])
+    fig.update_layout(
+        template="plotly_white",
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20),
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def feed_by_month_figure(analyzer):
+    _, total_feed = analyzer.get_summary_metrics()
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=list(total_feed.keys()),
+        y=list(total_feed.values()),
+        marker=dict(
+            color=list(total_feed.values()),
+            colorscale='Viridis',
+            line=dict(color='white', width=2)
+        ),
+        text=[f'{v:,.0f} kg' for v in total_feed.values()],
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>%{y:,.0f} kg<extra></extra>'
+    ))
+    fig.update_layout(
+        template="plotly_white",
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=False,
+        yaxis_title="Kilograms"
+    )
+    return fig
+
+def monthly_expense_comparison_figure(analyzer):
+    total_expenses, _ = analyzer.get_summary_metrics()
+    monthly_df = pd.DataFrame({
+        'Month': list(total_expenses.keys()),
+        'Expenses': list(total_expenses.values())
+    })
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=monthly_df['Month'],
+        y=monthly_df['Expenses'],
+        marker=dict(
+            color=[['#667eea', '#764ba2', '#f093fb'][i % 3] for i in range(len(monthly_df))],
+            line=dict(color='white', width=2)
+        ),
+        text=[f'${v:,.0f}' for v in monthly_df['Expenses']],
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>$%{y:,.0f}<extra></extra>'
+    ))
+    fig.update_layout(
+        template="plotly_white",
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=False,
+        yaxis_title="Dollars"
+    )
+    return fig
+
+def month_feed_distribution_figure(analyzer, month):
+    import plotly.express as px
+    fig = px.pie(analyzer.data[month]['feed'], values='Total_kg', names='Category',
+                title=f'Feed Distribution',
+                color_discrete_sequence=px.colors.sequential.Purp)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def month_expense_breakdown_figure(analyzer, month):
+    import plotly.express as px
+    fig = px.bar(analyzer.data[month]['expenses'], x='Item', y='Total_Cost',
+                title='Expense Breakdown',
+                color='Total_Cost',
+                color_continuous_scale='Sunset')
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis_tickangle=-45
+    )
+    return fig
+
+def feed_by_category_figure(analyzer):
+    import plotly.express as px
+    fig = px.bar(analyzer.get_feed_analysis(), x='Month', y='Total_kg', color='Category',
+                title="Monthly Feed Consumption by Category",
+                color_discrete_sequence=px.colors.qualitative.Bold,
+                barmode='group')
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def feed_efficiency_figure(analyzer, feed_items):
+    efficiency_df = analyzer.get_feed_efficiency(feed_items)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=efficiency_df['Month'],
+        y=efficiency_df['Cost_per_kg'],
+        mode='lines+markers',
+        name='Cost per kg',
+        line=dict(color='#667eea', width=4),
+        marker=dict(size=15, color='#764ba2', line=dict(color='white', width=2)),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)'
+    ))
+    fig.update_layout(
+        title='Feed Cost per kg Over Time',
+        height=400,
+        margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis_title='Cost per kg ($)'
+    )
+    return fig
+
+def expense_distribution_figure(analyzer):
+    import plotly.express as px
+    total_by_category = analyzer.get_expense_breakdown().sum(axis=1)
+    fig = px.pie(values=total_by_category.values, names=total_by_category.index,
+                title="Overall Expense Distribution",
+                color_discrete_sequence=px.colors.sequential.RdBu,
+                hole=0.4)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def expense_trends_figure(analyzer):
+    import plotly.express as px
+    expense_melted = analyzer.get_expense_breakdown().reset_index().melt(id_vars='index', var_name='Month', value_name='Cost')
+    expense_melted.columns = ['Category', 'Month', 'Cost']
+    
+    fig = px.bar(expense_melted, x='Month', y='Cost', color='Category',
+                 barmode='group',
+                 color_discrete_sequence=px.colors.qualitative.Bold)
+    fig.update_traces(marker=dict(line=dict(color='white', width=1)))
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis_title='Cost ($)',
+        xaxis_title='Month',
+        legend_title='Category'
+    )
+    return fig
+
+def monthly_contributions_figure(analyzer):
+    import plotly.express as px
+    colors = contributor_colors(analyzer.get_individual_totals())
+    fig = px.bar(analyzer.get_individual_monthly_totals(), x='Month', y='Amount', color='Contributor',
+                 barmode='group', color_discrete_map=colors)
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis_title='Contribution ($)',
+        legend_title=None
+    )
+    return fig
+
+def contribution_trends_figure(analyzer):
+    import plotly.express as px
+    colors = contributor_colors(analyzer.get_individual_totals())
+    fig = px.line(analyzer.get_individual_monthly_totals(), x='Month', y='Amount', color='Contributor',
+                  markers=True, color_discrete_map=colors)
+    fig.update_traces(line=dict(width=3), marker=dict(size=10))
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis_title='Contribution ($)',
+        legend_title=None,
+        hovermode='x unified'
+    )
+    return fig
+
+def expense_prediction_figure(analyzer):
+    total_expenses, _ = analyzer.get_summary_metrics()
+    months = list(total_expenses.keys())
+    expenses = list(total_expenses.values())
+    
+    future_months = future_month_labels(months[-1], 3)
+    avg_growth = (expenses[-1] - expenses[0]) / len(expenses)
+    predicted = [expenses[-1] + avg_growth * (i+1) for i in range(3)]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=months, y=expenses,
+        mode='lines+markers',
+        name='Actual',
+        line=dict(color='#667eea', width=4),
+        marker=dict(size=12, color='#764ba2')
+    ))
+    fig.add_trace(go.Scatter(
+        x=future_months, y=predicted,
+        mode='lines+markers',
+        name='Predicted',
+        line=dict(color='#f093fb', width=4, dash='dash'),
+        marker=dict(size=12, color='#f5576c')
+    ))
+    
+    fig.update_layout(
+        title='Expense Trend with 3-Month Prediction',
+        height=400,
+        margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis_title='Expenses ($)',
+        hovermode='x unified'
+    )
+    return fig
+
+# Chart id -> builder(analyzer, *params) returning a plotly Figure
+FIGURE_BUILDERS = {
+    'expense_trend': expense_trend_figure,
+    'team_contributions': team_contributions_figure,
+    'feed_by_month': feed_by_month_figure,
+    'monthly_expense_comparison': monthly_expense_comparison_figure,
+    'month_feed_distribution': month_feed_distribution_figure,
+    'month_expense_breakdown': month_expense_breakdown_figure,
+    'feed_by_category': feed_by_category_figure,
+    'feed_efficiency': feed_efficiency_figure,
+    'expense_distribution': expense_distribution_figure,
+    'expense_trends': expense_trends_figure,
+    'monthly_contributions': monthly_contributions_figure,
+    'contribution_trends': contribution_trends_figure,
+    'expense_prediction': expense_prediction_figure
+}
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def cached_figure(data_version, chart_id, params, _analyzer):
+    """Figure for one chart, built once per (dataset version, chart id, params)
+    
+    data_version is unique per dataset across analyzers, so the unhashed analyzer
+    argument is always the one the cached figure was built from. The figure is
+    shared by every session, so it must not be modified after it is built.
+    """
+    return FIGURE_BUILDERS[chart_id](_analyzer, *params)
+
+def show_figure(analyzer, chart_id, *params):
+    """Render a chart from the figure cache; reruns with unchanged data skip building it
+    
+    Passing the Figure itself lets st.plotly_chart serialize it without rebuilding
+    and validating it from a dict.
+    """
+    figure = cached_figure(analyzer.data_version, chart_id, params, analyzer)
+    st.plotly_chart(figure, use_container_width=True)
 
 def display_overview(analyzer):
     st.markdown('<div class="section-header">🏠 Project Overview</div>', unsafe_allow_html=True)
@@ -1336,12 +2059,12 @@ def display_overview(analyzer):
         <div class="metric-card">
             <div class="metric-title">TOTAL EXPENSES</div>
             <div class="metric-value">${total_cost:,.0f}</div>
-            <div class="metric-description">3 Months Total</div>
+            <div class="metric-description">{len(total_expenses)} Months Total</div>
         </div>
         ''', unsafe_allow_html=True)
     
     with col2:
-        avg_monthly_cost = total_cost / 3
+        avg_monthly_cost = total_cost / len(total_expenses) if total_expenses else 0
         st.markdown(f'''
         <div class="metric-card">
             <div class="metric-title">MONTHLY AVERAGE</div>
@@ -1366,7 +2089,7 @@ def display_overview(analyzer):
         <div class="metric-card">
             <div class="metric-title">TEAM CONTRIBUTIONS</div>
             <div class="metric-value">${total_individual_contributions:,.0f}</div>
-            <div class="metric-description">Yami, Mike & Kali</div>
+            <div class="metric-description">{describe_contributors(list(individual_totals))}</div>
         </div>
         ''', unsafe_allow_html=True)
     
@@ -1377,53 +2100,13 @@ def display_overview(analyzer):
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 📈 Expense Trends")
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=list(total_expenses.keys()),
-            y=list(total_expenses.values()),
-            mode='lines+markers',
-            name='Monthly Expenses',
-            line=dict(color='#667eea', width=4),
-            marker=dict(size=12, color='#764ba2', line=dict(color='white', width=2)),
-            fill='tozeroy',
-            fillcolor='rgba(102, 126, 234, 0.2)'
-        ))
-        fig.update_layout(
-            template="plotly_white",
-            height=350,
-            margin=dict(l=20, r=20, t=40, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(size=12, color='#2c3e50')
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'expense_trend')
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 👥 Team Contributions")
-        labels = list(individual_totals.keys())
-        values = list(individual_totals.values())
-        colors = ['#ff6b6b', '#4ecdc4', '#45b7d1']
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=labels, 
-            values=values, 
-            hole=.5,
-            marker_colors=colors,
-            textfont=dict(size=14, color='white'),
-            textinfo='label+percent',
-            hovertemplate='<b>%{label}</b><br>$%{value:,.0f}<br>%{percent}<extra></extra>'
-        )])
-        fig.update_layout(
-            template="plotly_white",
-            height=350,
-            margin=dict(l=20, r=20, t=40, b=20),
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'team_contributions')
         st.markdown('</div>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
@@ -1431,67 +2114,22 @@ def display_overview(analyzer):
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 🌾 Feed Consumption by Month")
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=list(total_feed.keys()),
-            y=list(total_feed.values()),
-            marker=dict(
-                color=list(total_feed.values()),
-                colorscale='Viridis',
-                line=dict(color='white', width=2)
-            ),
-            text=[f'{v:,.0f} kg' for v in total_feed.values()],
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>%{y:,.0f} kg<extra></extra>'
-        ))
-        fig.update_layout(
-            template="plotly_white",
-            height=350,
-            margin=dict(l=20, r=20, t=40, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            showlegend=False,
-            yaxis_title="Kilograms"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'feed_by_month')
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 💵 Monthly Expense Comparison")
-        monthly_df = pd.DataFrame({
-            'Month': list(total_expenses.keys()),
-            'Expenses': list(total_expenses.values())
-        })
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=monthly_df['Month'],
-            y=monthly_df['Expenses'],
-            marker=dict(
-                color=['#667eea', '#764ba2', '#f093fb'],
-                line=dict(color='white', width=2)
-            ),
-            text=[f'${v:,.0f}' for v in monthly_df['Expenses']],
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>$%{y:,.0f}<extra></extra>'
-        ))
-        fig.update_layout(
-            template="plotly_white",
-            height=350,
-            margin=dict(l=20, r=20, t=40, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            showlegend=False,
-            yaxis_title="Dollars"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'monthly_expense_comparison')
         st.markdown('</div>', unsafe_allow_html=True)
 
 def display_monthly_analysis(analyzer):
     st.markdown('<div class="section-header">📅 Monthly Analysis</div>', unsafe_allow_html=True)
     
-    month = st.selectbox("Select Month", ["September", "October", "November"], key="month_select")
+    month = st.selectbox("Select Month", list(analyzer.data.keys()), key="month_select")
+    if month is None:
+        st.info("No monthly data loaded")
+        return
     data = analyzer.data[month]
     
     col1, col2 = st.columns(2)
@@ -1500,42 +2138,23 @@ def display_monthly_analysis(analyzer):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown(f"#### 🐖 Feed Consumption - {month}")
         st.dataframe(data['feed'], use_container_width=True, hide_index=True)
-        
-        fig = px.pie(data['feed'], values='Total_kg', names='Category', 
-                    title=f'Feed Distribution',
-                    color_discrete_sequence=px.colors.sequential.Purp)
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=60, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'month_feed_distribution', month)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown(f"#### 💰 Expenses - {month}")
         st.dataframe(data['expenses'], use_container_width=True, hide_index=True)
-        
-        fig = px.bar(data['expenses'], x='Item', y='Total_Cost',
-                    title='Expense Breakdown',
-                    color='Total_Cost',
-                    color_continuous_scale='Sunset')
-        fig.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=60, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            xaxis_tickangle=-45
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'month_expense_breakdown', month)
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown(f"#### 👥 Individual Contributions - {month}")
-    st.dataframe(data['individuals'], use_container_width=True, hide_index=True)
+    # Contributions are stored long; show one column per contributor like the sheet does
+    individuals = data['individuals'].pivot_table(
+        index='Category', columns='Contributor', values='Amount', aggfunc='sum', fill_value=0, sort=False
+    ).rename_axis(columns=None).reset_index() if len(data['individuals']) else data['individuals']
+    st.dataframe(individuals, use_container_width=True, hide_index=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 def display_feed_consumption(analyzer):
@@ -1548,61 +2167,13 @@ def display_feed_consumption(analyzer):
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 📊 Feed by Category Over Time")
-        fig = px.bar(feed_df, x='Month', y='Total_kg', color='Category',
-                    title="Monthly Feed Consumption by Category",
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                    barmode='group')
-        fig.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=60, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'feed_by_category')
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 💹 Feed Efficiency")
-        total_expenses, total_feed = analyzer.get_summary_metrics()
-        
-        feed_cost_analysis = []
-        for month in total_expenses.keys():
-            feed_expenses = analyzer.data[month]['expenses']
-            feed_items = ['Cruches', 'Premix', 'Soya', 'Creep']
-            feed_cost = feed_expenses[feed_expenses['Item'].isin(feed_items)]['Total_Cost'].sum()
-            total_kg = total_feed[month]
-            cost_per_kg = feed_cost / total_kg if total_kg > 0 else 0
-            
-            feed_cost_analysis.append({
-                'Month': month,
-                'Feed_Cost': feed_cost,
-                'Total_Feed_kg': total_kg,
-                'Cost_per_kg': cost_per_kg
-            })
-        
-        efficiency_df = pd.DataFrame(feed_cost_analysis)
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=efficiency_df['Month'], 
-            y=efficiency_df['Cost_per_kg'],
-            mode='lines+markers',
-            name='Cost per kg',
-            line=dict(color='#667eea', width=4),
-            marker=dict(size=15, color='#764ba2', line=dict(color='white', width=2)),
-            fill='tozeroy',
-            fillcolor='rgba(102, 126, 234, 0.2)'
-        ))
-        fig.update_layout(
-            title='Feed Cost per kg Over Time',
-            height=400,
-            margin=dict(l=20, r=20, t=60, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            yaxis_title='Cost per kg ($)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'feed_efficiency', ('Cruches', 'Premix', 'Soya', 'Creep'))
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
@@ -1626,77 +2197,33 @@ def display_expense_breakdown(analyzer):
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 🥧 Expense Distribution")
-        total_by_category = expense_df.sum(axis=1)
-        fig = px.pie(values=total_by_category.values, names=total_by_category.index,
-                    title="Overall Expense Distribution",
-                    color_discrete_sequence=px.colors.sequential.RdBu,
-                    hole=0.4)
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=60, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'expense_distribution')
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown("#### 📈 Expense Trends by Category")
-    
-    expense_melted = expense_df.reset_index().melt(id_vars='index', var_name='Month', value_name='Cost')
-    expense_melted.columns = ['Category', 'Month', 'Cost']
-    
-    fig = px.bar(expense_melted, x='Month', y='Cost', color='Category',
-                 barmode='group',
-                 color_discrete_sequence=px.colors.qualitative.Bold)
-    fig.update_traces(marker=dict(line=dict(color='white', width=1)))
-    fig.update_layout(
-        height=400,
-        margin=dict(l=20, r=20, t=20, b=20),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        yaxis_title='Cost ($)',
-        xaxis_title='Month',
-        legend_title='Category'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    show_figure(analyzer, 'expense_trends')
     st.markdown('</div>', unsafe_allow_html=True)
 
 def display_individual_contributions(analyzer):
     st.markdown('<div class="section-header">👥 Team Contribution Analysis</div>', unsafe_allow_html=True)
     
     individual_totals = analyzer.get_individual_totals()
-    monthly_totals = analyzer.get_individual_monthly_totals()
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown(f'''
-        <div class="metric-card">
-            <div class="metric-title">YAMI</div>
-            <div class="metric-value">${individual_totals["Yami"]:,.0f}</div>
-            <div class="metric-description">Total Contribution</div>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f'''
-        <div class="metric-card">
-            <div class="metric-title">MIKE</div>
-            <div class="metric-value">${individual_totals["Mike"]:,.0f}</div>
-            <div class="metric-description">Total Contribution</div>
-        </div>
-        ''', unsafe_allow_html=True)
     
-    with col3:
-        st.markdown(f'''
-        <div class="metric-card">
-            <div class="metric-title">KALI</div>
-            <div class="metric-value">${individual_totals["Kali"]:,.0f}</div>
-            <div class="metric-description">Total Contribution</div>
-        </div>
-        ''', unsafe_allow_html=True)
+    # Wrap the cards onto extra rows once there are more contributors than fit side by side
+    cards_per_row = 4
+    names = list(individual_totals)
+    for row_start in range(0, len(names), cards_per_row):
+        row_names = names[row_start:row_start + cards_per_row]
+        for col, name in zip(st.columns(min(len(names), cards_per_row)), row_names):
+            with col:
+                st.markdown(f'''
+                <div class="metric-card">
+                    <div class="metric-title">{name.upper()}</div>
+                    <div class="metric-value">${individual_totals[name]:,.0f}</div>
+                    <div class="metric-description">Total Contribution</div>
+                </div>
+                ''', unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -1705,50 +2232,13 @@ def display_individual_contributions(analyzer):
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 📊 Monthly Contributions by Person")
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(name='Yami', x=monthly_totals['Month'], y=monthly_totals['Yami'], marker_color='#ff6b6b'))
-        fig.add_trace(go.Bar(name='Mike', x=monthly_totals['Month'], y=monthly_totals['Mike'], marker_color='#4ecdc4'))
-        fig.add_trace(go.Bar(name='Kali', x=monthly_totals['Month'], y=monthly_totals['Kali'], marker_color='#45b7d1'))
-        
-        fig.update_layout(
-            barmode='group',
-            height=400,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            yaxis_title='Contribution ($)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'monthly_contributions')
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("#### 📈 Contribution Trends")
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=monthly_totals['Month'], y=monthly_totals['Yami'], 
-                                mode='lines+markers', name='Yami',
-                                line=dict(color='#ff6b6b', width=3),
-                                marker=dict(size=10)))
-        fig.add_trace(go.Scatter(x=monthly_totals['Month'], y=monthly_totals['Mike'], 
-                                mode='lines+markers', name='Mike',
-                                line=dict(color='#4ecdc4', width=3),
-                                marker=dict(size=10)))
-        fig.add_trace(go.Scatter(x=monthly_totals['Month'], y=monthly_totals['Kali'], 
-                                mode='lines+markers', name='Kali',
-                                line=dict(color='#45b7d1', width=3),
-                                marker=dict(size=10)))
-        
-        fig.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            yaxis_title='Contribution ($)',
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure(analyzer, 'contribution_trends')
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
@@ -1799,10 +2289,11 @@ def display_recommendations(analyzer):
         metrics_data = [
             ("Total Project Cost", f"${total_cost:,.2f}", "💵"),
             ("Team Contributions", f"${total_contributions:,.2f}", "👥"),
-            ("Yami's Share", f"{(individual_totals['Yami']/total_contributions)*100:.1f}%", "👤"),
-            ("Mike's Share", f"{(individual_totals['Mike']/total_contributions)*100:.1f}%", "👤"),
-            ("Kali's Share", f"{(individual_totals['Kali']/total_contributions)*100:.1f}%", "👤"),
-            ("Avg Monthly Expense", f"${total_cost/3:,.2f}", "📅"),
+            *[
+                (f"{name}'s Share", f"{(amount/total_contributions if total_contributions else 0)*100:.1f}%", "👤")
+                for name, amount in individual_totals.items()
+            ],
+            ("Avg Monthly Expense", f"${total_cost/len(total_expenses) if total_expenses else 0:,.2f}", "📅"),
             ("Total Feed Used", f"{sum(total_feed.values()):,.0f} kg", "🌾")
         ]
         
@@ -1821,39 +2312,12 @@ def display_recommendations(analyzer):
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown("#### 🔮 Predictive Analysis")
     
-    months = list(total_expenses.keys())
-    expenses = list(total_expenses.values())
-    
-    future_months = ['December', 'January', 'February']
-    avg_growth = (expenses[-1] - expenses[0]) / len(expenses)
-    predicted = [expenses[-1] + avg_growth * (i+1) for i in range(3)]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=months, y=expenses,
-        mode='lines+markers',
-        name='Actual',
-        line=dict(color='#667eea', width=4),
-        marker=dict(size=12, color='#764ba2')
-    ))
-    fig.add_trace(go.Scatter(
-        x=future_months, y=predicted,
-        mode='lines+markers',
-        name='Predicted',
-        line=dict(color='#f093fb', width=4, dash='dash'),
-        marker=dict(size=12, color='#f5576c')
-    ))
+    if not total_expenses:
+        st.info("No monthly data loaded")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
     
-    fig.update_layout(
-        title='Expense Trend with 3-Month Prediction',
-        height=400,
-        margin=dict(l=20, r=20, t=60, b=20),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        yaxis_title='Expenses ($)',
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    show_figure(analyzer, 'expense_prediction')
     st.markdown('</div>', unsafe_allow_html=True)
 
 def display_chatbot(analyzer, chatbot):